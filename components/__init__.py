@@ -0,0 +1 @@
+"""Standalone components. Modules that build on each other import relatively, so run their examples with `python -m components.<module>`."""
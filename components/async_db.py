@@ -0,0 +1,274 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+import logging
+import os
+import threading
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator
+import weakref
+
+from .db import DB, Page
+
+logger = logging.getLogger(__name__)
+
+class AsyncDB:
+    """
+    asyncio facade over DB that runs every call on a bounded thread pool.
+    """
+
+    backend: type = None
+    max_per_table: int = 4
+    max_streams: int = 4
+
+    _executor: ThreadPoolExecutor = None
+    _semaphores = weakref.WeakKeyDictionary()  # event loop -> {table: asyncio.Semaphore}
+    _stream_slots = weakref.WeakKeyDictionary()  # event loop -> asyncio.Semaphore
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, max_workers: int = 10, max_per_table: int = 4, max_streams: int = 4, min_size: int = 1, idle_timeout: float = 300.0, wait_timeout: float = 10.0, backend: type = DB) -> None:
+        """
+        Create the worker pool and its connection pool, replacing any previous ones.
+
+        Example Usage:
+        AsyncDB.configure(max_workers=16, max_per_table=4, max_streams=4)
+        rows = await AsyncDB.get_rows('users', {'age': 30})
+        """
+        # A private subclass gets its own pool, prepared statements and transaction state
+        facade_backend = type(f'Async{backend.__name__}', (backend,), {
+            '_pool': None,
+            '_pool_lock': threading.Lock(),
+            '_local': threading.local(),
+            '_prepared': weakref.WeakKeyDictionary(),
+            '_prepared_lock': threading.Lock(),
+        })
+        if max_streams < 1:
+            raise ValueError(f'AsyncDB.configure.error: max_streams must be positive, got {max_streams}')
+        # Workers hold a connection only while running; each open stream holds one between batches
+        facade_backend.configurePool(min_size=min(min_size, max_workers), max_size=max_workers + max_streams, idle_timeout=idle_timeout, wait_timeout=wait_timeout)
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='AsyncDB')
+
+        with cls._lock:
+            old_backend, old_executor = cls.backend, cls._executor
+            cls.backend, cls._executor = facade_backend, executor
+            cls.max_per_table = max_per_table
+            cls.max_streams = max_streams
+            cls._semaphores = weakref.WeakKeyDictionary()
+            cls._stream_slots = weakref.WeakKeyDictionary()
+
+        if old_executor:
+            old_executor.shutdown(wait=False)
+        if old_backend:
+            old_backend.closePool()
+
+    @classmethod
+    async def close(cls) -> None:
+        """Wait for in-flight calls, then shut down the worker pool and close its connections."""
+        with cls._lock:
+            backend, executor = cls.backend, cls._executor
+            cls.backend, cls._executor = None, None
+        if executor:
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+        if backend:
+            backend.closePool()
+
+    @classmethod
+    async def create_table(cls, table_name: str, columns: dict) -> None:
+        return await cls._run(table_name, cls._backend().create_table, table_name, columns)
+
+    @classmethod
+    async def add_column(cls, table_name: str, column_name: str, column_datatype: str) -> None:
+        return await cls._run(table_name, cls._backend().add_column, table_name, column_name, column_datatype)
+
+    @classmethod
+    async def add_row(cls, table_name: str, data: dict) -> None:
+        return await cls._run(table_name, cls._backend().add_row, table_name, data)
+
+    @classmethod
+    async def add_rows(cls, table_name: str, rows: Iterable[dict], **kwargs) -> list:
+        return await cls._run(table_name, cls._backend().add_rows, table_name, rows, **kwargs)
+
+    @classmethod
+    async def upsert_rows(cls, table_name: str, rows: Iterable[dict], key_columns: Iterable[str], **kwargs) -> list:
+        return await cls._run(table_name, cls._backend().upsert_rows, table_name, rows, key_columns, **kwargs)
+
+    @classmethod
+    async def update_row(cls, table_name: str, updates: dict, conditions: dict) -> None:
+        return await cls._run(table_name, cls._backend().update_row, table_name, updates, conditions)
+
+    @classmethod
+    async def update_rows(cls, table_name: str, rows: Iterable[dict], key_column: str, **kwargs) -> list:
+        return await cls._run(table_name, cls._backend().update_rows, table_name, rows, key_column, **kwargs)
+
+    @classmethod
+    async def delete_row(cls, table_name: str, conditions: dict) -> None:
+        return await cls._run(table_name, cls._backend().delete_row, table_name, conditions)
+
+    @classmethod
+    async def delete_rows(cls, table_name: str, key_column: str, keys: Iterable[Any], **kwargs) -> list:
+        return await cls._run(table_name, cls._backend().delete_rows, table_name, key_column, keys, **kwargs)
+
+    @classmethod
+    async def get_rows(cls, table_name: str, conditions: dict = None, **kwargs) -> list:
+        return await cls._run(table_name, cls._backend().get_rows, table_name, conditions, **kwargs)
+
+    @classmethod
+    async def get_row_as_dict(cls, table_name: str, conditions: dict = None, **kwargs) -> dict | None:
+        return await cls._run(table_name, cls._backend().get_row_as_dict, table_name, conditions, **kwargs)
+
+    @classmethod
+    async def get_columns(cls, table_name: str, conditions: dict = None, **kwargs) -> dict:
+        return await cls._run(table_name, cls._backend().get_columns, table_name, conditions, **kwargs)
+
+    @classmethod
+    async def iter_rows(cls, table_name: str, conditions: dict = None, batch_size: int = 1000, **kwargs) -> AsyncIterator[tuple]:
+        """
+        Stream rows; each `fetchmany` batch is read on a worker while the loop stays free.
+
+        Example Usage:
+        async with aclosing(AsyncDB.iter_rows('events', batch_size=5000)) as rows:
+            async for row in rows:
+                ...
+        """
+        query, params = cls._backend()._selectQuery(table_name, conditions, **kwargs)
+        # aclosing: closing this generator must close the inner stream too, not leave it to the GC
+        async with aclosing(cls._stream(table_name, cls._backend()._iterBatches(query, params, batch_size))) as batches:
+            async for _, batch in batches:
+                for row in batch:
+                    yield row
+
+    @classmethod
+    async def iter_rows_as_dict(cls, table_name: str, conditions: dict = None, batch_size: int = 1000, **kwargs) -> AsyncIterator[dict]:
+        query, params = cls._backend()._selectQuery(table_name, conditions, **kwargs)
+        names = None
+        async with aclosing(cls._stream(table_name, cls._backend()._iterBatches(query, params, batch_size))) as batches:
+            async for description, batch in batches:
+                if names is None:
+                    names = tuple(col[0] for col in description)
+                for row in batch:
+                    yield dict(zip(names, row))
+
+    @classmethod
+    async def paginate(cls, table_name: str, key_column: str, page_size: int = 1000, **kwargs) -> AsyncIterator[Page]:
+        # paginate holds no connection between pages, so it does not take a stream slot
+        async with aclosing(cls._stream(table_name, cls._backend().paginate(table_name, key_column, page_size, **kwargs), holds_connection=False)) as pages:
+            async for page in pages:
+                yield page
+
+    @classmethod
+    def _backend(cls) -> type:
+        if cls.backend is None:
+            raise RuntimeError('AsyncDB.error: call AsyncDB.configure() first')
+        return cls.backend
+
+    @classmethod
+    def _semaphore(cls, table_name: str) -> asyncio.Semaphore:
+        """Per-table concurrency limit, one set per event loop."""
+        loop = asyncio.get_running_loop()
+        semaphores = cls._semaphores.setdefault(loop, {})
+        semaphore = semaphores.get(table_name)
+        if semaphore is None:
+            semaphore = semaphores[table_name] = asyncio.Semaphore(cls.max_per_table)
+        return semaphore
+
+    @classmethod
+    def _streamSlots(cls) -> asyncio.Semaphore:
+        """Limit on open connection-holding streams, one per event loop."""
+        loop = asyncio.get_running_loop()
+        slots = cls._stream_slots.get(loop)
+        if slots is None:
+            slots = cls._stream_slots[loop] = asyncio.Semaphore(cls.max_streams)
+        return slots
+
+    @classmethod
+    async def _run(cls, table_name: str, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking DB call on the worker pool under the table's concurrency limit."""
+        executor = cls._executor
+        if executor is None:
+            raise RuntimeError('AsyncDB.error: call AsyncDB.configure() first')
+
+        cancelled = threading.Event()
+
+        def job():
+            if cancelled.is_set():
+                return None  # Cancelled while queued behind other workers
+            return func(*args, **kwargs)
+
+        async with cls._semaphore(table_name):
+            future = asyncio.get_running_loop().run_in_executor(executor, job)
+            try:
+                return await future
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+    @classmethod
+    async def _stream(cls, table_name: str, iterator: Iterator, holds_connection: bool = True) -> AsyncIterator[Any]:
+        """
+        Step a blocking iterator on the worker pool, one item per hop, closing it on early exit.
+        A stream that keeps its connection between hops holds a stream slot for its whole lifetime.
+        """
+        executor = cls._executor
+        if executor is None:
+            raise RuntimeError('AsyncDB.error: call AsyncDB.configure() first')
+
+        done = object()
+        slots = cls._streamSlots() if holds_connection else None
+        if slots is not None:
+            try:
+                await slots.acquire()
+            except BaseException:
+                iterator.close()  # Never started, so closing does not touch the network
+                raise
+        step = None
+        try:
+            while True:
+                async with cls._semaphore(table_name):
+                    step = executor.submit(next, iterator, done)
+                    item = await asyncio.wrap_future(step)
+                step = None
+                if item is done:
+                    return
+                yield item
+        finally:
+            try:
+                # Cancelling the await does not stop a next() already running on a worker, and closing
+                # a generator that is still executing raises ValueError, so let the step finish first
+                while step is not None and not step.done():
+                    try:
+                        await asyncio.wait([asyncio.wrap_future(step)])
+                    except asyncio.CancelledError:
+                        pass  # Already unwinding from a cancellation, which is re-raised below
+                # Releases the connection (on a worker: closing may block on the network)
+                if cls._executor is not None:
+                    await asyncio.shield(asyncio.get_running_loop().run_in_executor(cls._executor, iterator.close))
+                else:
+                    iterator.close()
+            finally:
+                if slots is not None:
+                    slots.release()
+
+# Example usage (run from the repository root: python -m components.async_db)
+if __name__ == '__main__':
+    Env = 'DEV'
+
+    DB.setCredentials(
+        symmetric_key=os.getenv(f'{Env}_DB_SYMMETRIC_KEY').encode(),
+        host=os.getenv(f'{Env}_DB_HOST').encode(),
+        port=os.getenv(f'{Env}_DB_PORT').encode(),
+        user=os.getenv(f'{Env}_DB_USER').encode(),
+        password=os.getenv(f'{Env}_DB_PASSWORD').encode(),
+        database=os.getenv(f'{Env}_DB_DATABASE').encode()
+    )
+
+    async def main():
+        AsyncDB.configure(max_workers=8, max_per_table=4)
+        try:
+            rows = await asyncio.gather(*(AsyncDB.get_rows('test', {'age': age}) for age in range(20, 30)))
+            print(sum(len(r or []) for r in rows))
+            async for row in AsyncDB.iter_rows('test', batch_size=500):
+                print(row)
+        finally:
+            await AsyncDB.close()
+
+    asyncio.run(main())
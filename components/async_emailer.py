@@ -0,0 +1,277 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Iterable
+
+try:
+    import aiosmtplib
+except ImportError:  # Optional dependency: pip install aiosmtplib
+    aiosmtplib = None
+
+from .emailer import EmailerBase, MailMergeTemplate
+from .secret_cache import SecretCache
+
+logger = logging.getLogger(__name__)
+
+class AsyncSMTPSession:
+    """An authenticated aiosmtplib client plus its usage counters."""
+
+    def __init__(self, client: 'aiosmtplib.SMTP') -> None:
+        self.client = client
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+    async def isAlive(self) -> bool:
+        if not self.client.is_connected:
+            return False
+        try:
+            return (await self.client.noop()).code == 250
+        except (aiosmtplib.SMTPException, OSError):
+            return False
+
+    async def quit(self) -> None:
+        try:
+            await self.client.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            self.client.close()
+
+    def close(self) -> None:
+        """Drop the connection without a QUIT round trip; used when its state is unknown."""
+        self.client.close()
+
+class AsyncSMTPSessionPool:
+    """
+    Pool of up to `pool_size` authenticated SMTP sessions for one event loop.
+
+    Each session carries one mail transaction at a time, so `pool_size` is also the number of
+    messages in flight. Sessions are checked with NOOP before reuse and replaced when they fail
+    it, have been idle for more than `idle_timeout` seconds, or have sent `max_messages` messages.
+    """
+
+    def __init__(self, connect: Callable[[], Awaitable['aiosmtplib.SMTP']], pool_size: int = 4, max_messages: int = 100, idle_timeout: float = 60.0) -> None:
+        if pool_size < 1:
+            raise ValueError(f'Invalid pool size: {pool_size}')
+        self.connect = connect
+        self.pool_size = pool_size
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+
+        self._idle = []
+        self._slots = asyncio.Semaphore(pool_size)
+        self._closed = False
+
+    async def acquire(self) -> AsyncSMTPSession:
+        if self._closed:
+            raise RuntimeError('AsyncSMTPSessionPool.acquire.error: pool is closed')
+        await self._slots.acquire()
+        try:
+            if self._closed:
+                raise RuntimeError('AsyncSMTPSessionPool.acquire.error: pool is closed')
+            session = self._idle.pop() if self._idle else None
+            if session is not None and (time.monotonic() - session.last_used > self.idle_timeout or not await session.isAlive()):
+                session.close()
+                session = None
+            if session is None:
+                session = AsyncSMTPSession(await self.connect())
+            return session
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, session: AsyncSMTPSession, discard: bool = False) -> None:
+        session.last_used = time.monotonic()
+        if discard or self._closed or session.sent >= self.max_messages:
+            session.close()
+        else:
+            self._idle.append(session)
+        self._slots.release()
+
+    def abort(self) -> None:
+        """Close the pool, dropping idle sessions without QUIT."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for session in idle:
+            session.close()
+
+    async def close(self) -> None:
+        self._closed = True
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(session.quit() for session in idle), return_exceptions=True)
+
+class AsyncEmailer(EmailerBase):
+    """
+    asyncio counterpart of Emailer built on aiosmtplib (optional dependency).
+
+    Credentials are set and decrypted by the same EmailerBase code as Emailer's, but kept separately. Sends run on non-blocking SMTP
+    connections, so thousands of emails can be in flight without a thread each. Concurrency
+    comes from a pool of authenticated sessions (`configureSession`), one transaction per session
+    at a time; aiosmtplib does not pipeline commands within a session.
+
+    Every send is bounded by a per-message timeout and can be cancelled. A session that was
+    mid-transaction when its send timed out or was cancelled is dropped, not reused.
+    """
+
+    secrets = SecretCache()  # Call AsyncEmailer.secrets.clear() to drop the decrypted credentials
+    timeout: float = 30.0
+    _sessions: AsyncSMTPSessionPool = None
+
+    @classmethod
+    def configureSession(cls, pool_size: int = 4, max_messages: int = 100, idle_timeout: float = 60.0, timeout: float = 30.0) -> None:
+        """
+        Keep up to `pool_size` authenticated sessions open, replacing any existing pool.
+
+        `timeout` is the default per-message limit covering the wait for a session and the send
+        itself. Without a pool every email opens and closes its own connection. A pool belongs to
+        the event loop that first uses it; call `closeSessions()` before that loop ends.
+
+        Example Usage:
+        AsyncEmailer.configureSession(pool_size=8, max_messages=200, timeout=20)
+        """
+        cls._requireBackend()
+        old_pool, cls._sessions = cls._sessions, AsyncSMTPSessionPool(cls._connect, pool_size=pool_size, max_messages=max_messages, idle_timeout=idle_timeout)
+        cls.timeout = timeout
+        if old_pool:
+            old_pool.abort()
+
+    @classmethod
+    async def closeSessions(cls) -> None:
+        """Quit all pooled sessions and go back to one connection per email."""
+        old_pool, cls._sessions = cls._sessions, None
+        if old_pool:
+            await old_pool.close()
+
+    @classmethod
+    async def sendEmail(cls, recipient, subject, body, sender=None, timeout: float = None) -> bool:
+        """
+        Send one email; returns False (and logs) on failure or timeout. Cancellation propagates.
+
+        Example Usage:
+        await asyncio.gather(*(AsyncEmailer.sendEmail(user.email, 'Welcome', body) for user in users))
+        """
+        cls._requireBackend()
+        timeout = timeout if timeout is not None else cls.timeout
+        try:
+            await asyncio.wait_for(cls._deliver(*cls._buildMessage(recipient, subject, body, sender)), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.error(f'Timed out sending email to {recipient} after {timeout}s')
+        except aiosmtplib.SMTPException as e:
+            logger.error(f'Failed to send email: {e}')
+        except Exception as e:
+            logger.error(f'Unexpected error: {e}')
+        return False
+
+    @classmethod
+    async def sendMerge(cls, template: MailMergeTemplate, recipients: Iterable[dict], concurrency: int = None, timeout: float = None) -> dict:
+        """
+        Render and send `template` once per recipient with up to `concurrency` sends in flight.
+
+        Recipients are pulled lazily from the iterable as sends complete, so a generator keeps
+        memory flat. `concurrency` defaults to the session pool size. Returns
+        {'sent', 'failed', 'seconds'}.
+
+        Example Usage:
+        template = MailMergeTemplate('News for $name', 'Hello $name,\\n\\nYour code is $code.')
+        await AsyncEmailer.sendMerge(template, ({'email': user.email, 'name': user.name, 'code': user.code} for user in users))
+        """
+        cls._requireBackend()
+        started = time.monotonic()
+        timeout = timeout if timeout is not None else cls.timeout
+        if concurrency is None:
+            concurrency = cls._sessions.pool_size if cls._sessions else 1
+        from_address = template.sender or cls.accessCredentials()[0]
+        iterator = iter(recipients)
+        counts = {'sent': 0, 'failed': 0}
+
+        async def worker():
+            for fields in iterator:  # Shared by all workers; each takes the next recipient
+                try:
+                    await asyncio.wait_for(cls._deliver(*template.render(fields, from_address)), timeout)
+                    counts['sent'] += 1
+                except Exception as e:
+                    logger.error(f'Failed to send email to {fields.get(template.recipient_field)}: {e!r}')
+                    counts['failed'] += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        counts['seconds'] = time.monotonic() - started
+        return counts
+
+    @staticmethod
+    def _requireBackend() -> None:
+        if aiosmtplib is None:
+            raise ImportError('AsyncEmailer requires aiosmtplib: pip install aiosmtplib')
+
+    @classmethod
+    async def _connect(cls) -> 'aiosmtplib.SMTP':
+        """Open an authenticated SMTP connection."""
+        cls._requireBackend()
+        login_email, login_password, smtp_server, smtp_port = cls.accessCredentials()
+
+        client = aiosmtplib.SMTP(hostname=smtp_server, port=int(smtp_port), start_tls=cls.starttls, timeout=cls.timeout)
+        try:
+            await client.connect()  # Upgrades with STARTTLS unless starttls is off
+            await client.login(login_email, login_password)
+        except BaseException:
+            client.close()
+            raise
+        return client
+
+    @classmethod
+    async def _deliver(cls, from_address: str, recipient, message: str | bytes) -> None:
+        """Send one message, through a pooled session when configured; raises on failure."""
+        pool = cls._sessions
+        if pool is None:
+            session = AsyncSMTPSession(await cls._connect())
+            try:
+                await cls._sendmail(session.client, from_address, recipient, message)
+            except BaseException:
+                session.close()
+                raise
+            await session.quit()
+            return
+
+        session = await pool.acquire()
+        try:
+            try:
+                await cls._sendmail(session.client, from_address, recipient, message)
+            except aiosmtplib.SMTPServerDisconnected:
+                logger.info('SMTP session dropped mid-send; reconnecting.')
+                session.close()
+                session.client, session.sent = await cls._connect(), 0
+                await cls._sendmail(session.client, from_address, recipient, message)
+        except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused):
+            pool.release(session)  # The server rejected this message; the session itself is still usable
+            raise
+        except BaseException:
+            pool.release(session, discard=True)  # Includes timeouts and cancellation mid-transaction
+            raise
+        session.sent += 1
+        pool.release(session)
+
+    @classmethod
+    async def _sendmail(cls, client: 'aiosmtplib.SMTP', from_address: str, recipient, message: str | bytes) -> None:
+        """sendmail, declaring 8BITMIME for non-ASCII bytes or re-encoding them as base64 if the server lacks it."""
+        message, mail_options = cls._mailOptions(message, client.supports_extension('8bitmime'))
+        await client.sendmail(from_address, recipient, message, mail_options=mail_options)
+
+# Example usage (run from the repository root: python -m components.async_emailer)
+if __name__ == '__main__':
+    AsyncEmailer.setCredentials(
+        symmetric_key=os.getenv('EMAILER_LOGIN_SYMMETRIC_KEY').encode(),
+        login_email=os.getenv('EMAILER_LOGIN_EMAIL').encode(),
+        login_password=os.getenv('EMAILER_LOGIN_PASSWORD').encode(),
+        smtp_server=os.getenv('EMAILER_SMTP_SERVER').encode(),
+        smtp_port=os.getenv('EMAILER_SMTP_PORT').encode()
+    )
+
+    async def main():
+        AsyncEmailer.configureSession(pool_size=4, timeout=20)
+        try:
+            recipients = ['...']
+            results = await asyncio.gather(*(AsyncEmailer.sendEmail(recipient, 'Test Email', 'This is a test email.') for recipient in recipients))
+            print(results)
+        finally:
+            await AsyncEmailer.closeSessions()
+
+    asyncio.run(main())
@@ -1,12 +1,458 @@
+import base64
+from bisect import bisect_left
+import bz2
+from collections import deque, OrderedDict
 from contextlib import contextmanager
-from cryptography.fernet import Fernet
-from datetime import datetime
+import csv
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache, partial, wraps
+import gzip
+import inspect
+from itertools import islice
+import json
 import logging
+import lzma
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, FieldFlag, FieldType
 import os
+import re
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+import weakref
+
+try:
+    import numpy as np
+except ImportError:  # Only needed for DB.get_columns
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Only needed for DB.export_table(format='parquet')
+    pa = pq = None
+
+from .secret_cache import SecretCache
 
 logger = logging.getLogger(__name__)
+slow_logger = logging.getLogger(f'{__name__}.slow')
+
+class ConnectionPool:
+    """
+    Thread-safe pool of live connections, reused most-recently-used first and pinged before reuse.
+    """
+
+    def __init__(self, factory: Callable[[], Any], min_size: int = 1, max_size: int = 10, idle_timeout: float = 300.0, wait_timeout: float = 10.0, ping: Callable[[Any], bool] = None) -> None:
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f'Invalid pool size: min_size={min_size}, max_size={max_size}')
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.wait_timeout = wait_timeout
+        self.ping = ping if ping else (lambda conn: conn.is_connected())
+
+        self._idle = deque()  # (connection, last_used), oldest on the left
+        self._size = 0  # Live connections, idle and checked out
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def acquire(self, timeout: float = None) -> Any:
+        """Check out a healthy connection, opening a new one if the pool has room."""
+        timeout = self.wait_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError('ConnectionPool.acquire.error: pool is closed')
+                expired = self._takeExpired()
+                if expired:
+                    self._cond.notify_all()
+                    break
+                if self._idle or self._size < self.max_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f'ConnectionPool.acquire.error: no connection available after {timeout}s')
+                self._cond.wait(remaining)
+
+            conn = self._idle.pop()[0] if self._idle else None
+            if conn is None:
+                self._size += 1  # Reserve the slot before connecting outside the lock
+
+        for stale in expired:
+            self._closeQuietly(stale)
+
+        if conn is not None:
+            if self._isHealthy(conn):
+                return conn
+            logger.info('ConnectionPool: discarding dead connection.')
+            self._closeQuietly(conn)  # Keep its slot and open a replacement
+
+        try:
+            return self.factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn: Any, discard: bool = False) -> None:
+        """Return a connection to the pool, or close it when `discard` is set."""
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            self._cond.notify()
+
+        if conn is not None:
+            self._closeQuietly(conn)
+
+    def fill(self) -> int:
+        """Open connections until `min_size` are live, so the first burst of calls skips the handshakes; returns how many were opened."""
+        opened = 0
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return opened
+                self._size += 1  # Reserve the slot before connecting outside the lock
+            try:
+                conn = self.factory()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            self.release(conn)
+            opened += 1
+
+    def close(self) -> None:
+        """Close all idle connections; checked-out ones are closed as they are released."""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+
+        for conn in idle:
+            self._closeQuietly(conn)
+
+    def stats(self) -> dict:
+        """Return the current pool occupancy."""
+        with self._cond:
+            return {'size': self._size, 'idle': len(self._idle), 'in_use': self._size - len(self._idle), 'max_size': self.max_size}
+
+    def _takeExpired(self) -> list:
+        """Pop idle connections past `idle_timeout`, keeping at least `min_size` alive. Caller holds the lock."""
+        expired = []
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            expired.append(self._idle.popleft()[0])
+            self._size -= 1
+        return expired
+
+    def _isHealthy(self, conn: Any) -> bool:
+        try:
+            return bool(self.ping(conn))
+        except Exception:
+            return False
+
+    @staticmethod
+    def _closeQuietly(conn: Any) -> None:
+        try:
+            conn.close()
+        except Exception as error:
+            logger.info(f'ConnectionPool.close.error: {error}')
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of read results with an optional TTL and per-table invalidation.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = None) -> None:
+        if max_entries < 1:
+            raise ValueError(f'Invalid cache size: max_entries={max_entries}')
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._entries = OrderedDict()  # key -> (table, stored_at, value), least recently used first
+        self._generations = {}  # table -> int
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def getOrLoad(self, table_name: str, key: tuple, load: Callable[[], Any]) -> Any:
+        """Return a copy of the cached value for `key`, calling `load` on a miss."""
+        try:
+            hash(key)
+        except TypeError:
+            return load()  # Unhashable condition values are never cached
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or time.monotonic() - entry[1] <= self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._copy(entry[2])
+            if entry is not None:
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            generation = self._generations.get(table_name, 0)
+
+        value = load()
+        if value is None:
+            return value
+
+        with self._lock:
+            if self._generations.get(table_name, 0) == generation:
+                self._entries[key] = (table_name, time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return self._copy(value)
+
+    def invalidate(self, table_name: str) -> None:
+        """Drop every cached result for `table_name`."""
+        with self._lock:
+            self._generations[table_name] = self._generations.get(table_name, 0) + 1
+            stale = [key for key, entry in self._entries.items() if entry[0] == table_name]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        """Drop every cached result and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._generations = {table: generation + 1 for table, generation in self._generations.items()}
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict:
+        """Return the hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        """Shallow-copy containers so callers cannot mutate the cached value."""
+        if isinstance(value, list):
+            return list(value)
+        if isinstance(value, dict):
+            return dict(value)
+        return value
+
+class LatencyHistogram:
+    """Fixed log-scale latency histogram (~50us to ~100s, doubling buckets) with approximate percentiles."""
+
+    BOUNDS = tuple(0.00005 * 2 ** i for i in range(22))
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.counts[bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples (capped at the observed max)."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(self.BOUNDS[index], self.max) if index < len(self.BOUNDS) else self.max
+        return self.max
+
+class QueryStats:
+    """
+    Thread-safe per (operation, table) timings, row counts and latency histograms for DB calls.
+    """
+
+    PHASES = ('decrypt', 'acquire', 'connect', 'execute', 'fetch', 'commit')
+
+    def __init__(self, slow_query_threshold: float = None) -> None:
+        self.slow_query_threshold = slow_query_threshold
+        self._entries = {}  # (operation, table) -> dict
+        self._lock = threading.Lock()
+
+    def record(self, timer: 'OperationTimer', seconds: float, failed: bool) -> None:
+        """Fold a finished operation into the aggregates."""
+        key = (timer.operation, timer.table_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {
+                    'calls': 0,
+                    'errors': 0,
+                    'rows_affected': 0,
+                    'rows_returned': 0,
+                    'phases': dict.fromkeys(self.PHASES, 0.0),
+                    'latency': LatencyHistogram(),
+                }
+            entry['calls'] += 1
+            entry['errors'] += failed
+            entry['rows_affected'] += timer.rows_affected
+            entry['rows_returned'] += timer.rows_returned
+            for phase, elapsed in timer.phases.items():
+                entry['phases'][phase] += elapsed
+            entry['latency'].add(seconds)
+
+        if self.slow_query_threshold is not None and seconds >= self.slow_query_threshold:
+            phases = ', '.join(f'{phase}={elapsed * 1000:.1f}ms' for phase, elapsed in timer.phases.items() if elapsed)
+            slow_logger.warning(f'{timer.operation} on \'{timer.table_name}\' took {seconds * 1000:.1f}ms ({phases}): {self.normalizeSql(timer.sql)}')
+
+    def snapshot(self) -> dict:
+        """Return the aggregates as plain dicts keyed by 'operation:table'."""
+        with self._lock:
+            result = {}
+            for (operation, table_name), entry in self._entries.items():
+                latency = entry['latency']
+                result[f'{operation}:{table_name}'] = {
+                    'calls': entry['calls'],
+                    'errors': entry['errors'],
+                    'rows_affected': entry['rows_affected'],
+                    'rows_returned': entry['rows_returned'],
+                    'phases': dict(entry['phases']),
+                    'latency': {
+                        'mean': latency.total / latency.count if latency.count else 0.0,
+                        'p50': latency.percentile(0.50),
+                        'p95': latency.percentile(0.95),
+                        'p99': latency.percentile(0.99),
+                        'max': latency.max,
+                    },
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def normalizeSql(sql: str | None) -> str:
+        """Reduce a statement to its shape: literals redacted, repeated value groups collapsed."""
+        if not sql:
+            return ''
+        shape = re.sub(r"'(?:[^'\\]|\\.|'')*'|\b\d+(?:\.\d+)?\b", '?', sql)
+        shape = re.sub(r'(\((?:%s|\?)(?:, (?:%s|\?))*\))(?:, \1)+', r'\1, ...', shape)
+        shape = re.sub(r'\((?:%s|\?)(?:, (?:%s|\?)){3,}\)', '(...)', shape)
+        return ' '.join(shape.split())
+
+class OperationTimer:
+    """Phase timings and row counts accumulated while one DB operation runs."""
+
+    def __init__(self, operation: str, table_name: str) -> None:
+        self.operation = operation
+        self.table_name = table_name
+        self.phases = {}
+        self.rows_affected = 0
+        self.rows_returned = 0
+        self.sql = None
+        self.seconds = 0.0  # Time spent running; a generator's suspensions are not counted
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+def instrumented(operation: str) -> Callable:
+    """Decorator timing a DB classmethod whose first argument is the table name."""
+    def decorator(func: Callable) -> Callable:
+        if inspect.isgeneratorfunction(func):
+            @wraps(func)
+            def generator_wrapper(cls, table_name: str = '', *args, **kwargs):
+                stats = cls._stats
+                if stats is None:
+                    yield from func(cls, table_name, *args, **kwargs)
+                    return
+
+                # Only the work inside each next() is timed, not the consumer's time between items
+                timer = OperationTimer(operation, table_name)
+                inner = func(cls, table_name, *args, **kwargs)
+                failed = False
+                try:
+                    while True:
+                        with cls._resumeOperation(timer):
+                            try:
+                                item = next(inner)
+                            except StopIteration:
+                                return
+                        yield item
+                except BaseException as error:
+                    failed = not isinstance(error, GeneratorExit)
+                    raise
+                finally:
+                    with cls._resumeOperation(timer):
+                        inner.close()  # Releasing the cursor and connection is part of the operation
+                    stats.record(timer, timer.seconds, failed)
+            return generator_wrapper
+
+        @wraps(func)
+        def wrapper(cls, table_name: str = '', *args, **kwargs):
+            with cls._instrument(operation, table_name):
+                return func(cls, table_name, *args, **kwargs)
+        return wrapper
+    return decorator
+
+class Page(NamedTuple):
+    """One page from `DB.paginate`: the rows and the resume cursor pointing just past them."""
+    rows: list
+    cursor: str
+
+class Transaction:
+    """
+    Unit of work returned by `DB.transaction()`; its operations share one connection and commit together.
+    """
+
+    def __init__(self, db: type, conn: mysql.connector.MySQLConnection) -> None:
+        self.db = db
+        self.conn = conn
+        self._savepoints = 0
+        self.touched = set()  # Tables written, invalidated again once the transaction ends
+
+    def __getattr__(self, name: str) -> Any:
+        """Expose the DB operations, e.g. `tx.add_row(...)`."""
+        return getattr(self.db, name)
+
+    @contextmanager
+    def savepoint(self) -> Iterator['Transaction']:
+        """Run a nested block that is rolled back on its own if it raises."""
+        self._savepoints += 1
+        name = f'sp_{self._savepoints}'
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f'SAVEPOINT {name}')
+            try:
+                yield self
+            except BaseException:
+                cursor.execute(f'ROLLBACK TO SAVEPOINT {name}')
+                cursor.execute(f'RELEASE SAVEPOINT {name}')
+                raise
+            cursor.execute(f'RELEASE SAVEPOINT {name}')
+        finally:
+            cursor.close()
 
 class DB:
     
@@ -18,8 +464,15 @@ class DB:
     database: bytes
 
     inited: bool = False
-    conn: mysql.connector.MySQLConnection = None
-    cursor: mysql.connector = None
+    secrets = SecretCache()  # Call DB.secrets.clear() to drop the decrypted credentials
+    _pool: ConnectionPool = None
+    _pool_lock = threading.Lock()
+    _local = threading.local()  # Per-thread active Transaction
+    _cache: QueryCache = None
+    max_prepared_statements: int = 32  # Per pooled connection
+    _prepared = weakref.WeakKeyDictionary()  # connection -> OrderedDict[sql, prepared cursor]
+    _prepared_lock = threading.Lock()
+    _stats: QueryStats = None
     
     @classmethod
     def setCredentials(cls, symmetric_key: bytes, host: bytes, port: bytes, user: bytes, password: bytes, database: bytes):
@@ -29,61 +482,347 @@ class DB:
         cls.user = user
         cls.password = password
         cls.database = database
+        cls.secrets.rotate(symmetric_key, host=host, port=port, user=user, password=password, database=database)
         cls.inited = True
     
     @classmethod
     def accessCredentials(cls) -> tuple:
-        cipher = Fernet(cls.symmetric_key)
-
-        host = cipher.decrypt(cls.host).decode()
-        port = cipher.decrypt(cls.port).decode()
-        user = cipher.decrypt(cls.user).decode()
-        password = cipher.decrypt(cls.password).decode()
-        database = cipher.decrypt(cls.database).decode()
+        """Return the decrypted credentials; they are decrypted once and then served from `DB.secrets`."""
+        with cls._phase('decrypt'):
+            host, port, user, password, database = cls.secrets.get('host', 'port', 'user', 'password', 'database')
 
         return host, port, user, password, database
 
     @classmethod
-    def connect(cls) -> None:
-        """Establish a connection to the database."""
+    def configurePool(cls, min_size: int = 1, max_size: int = 10, idle_timeout: float = 300.0, wait_timeout: float = 10.0) -> None:
+        """
+        Switch DB into pooled mode with `min_size` connections opened up front, replacing any existing pool.
+
+        Example Usage:
+        DB.configurePool(min_size=2, max_size=20, idle_timeout=120, wait_timeout=5)
+        """
+        pool = ConnectionPool(cls.connect, min_size=min_size, max_size=max_size, idle_timeout=idle_timeout, wait_timeout=wait_timeout)
+        try:
+            pool.fill()
+        except Exception as error:
+            # Not fatal: the pool still opens connections on demand once the database is reachable
+            logger.warning(f'DB.configurePool.error: could not open {min_size} connection(s) up front: {error}')
+        with cls._pool_lock:
+            old_pool, cls._pool = cls._pool, pool
+        if old_pool:
+            old_pool.close()
+        logger.info(f'Connection pool configured (min={min_size}, max={max_size}).')
+
+    @classmethod
+    def closePool(cls) -> None:
+        """Close the pool and fall back to one connection per call."""
+        with cls._pool_lock:
+            old_pool, cls._pool = cls._pool, None
+        if old_pool:
+            old_pool.close()
+            logger.info('Connection pool closed.')
+
+    @classmethod
+    def connect(cls) -> mysql.connector.MySQLConnection:
+        """Open and return a new connection to the database."""
         host, port, user, password, database = cls.accessCredentials()
         
         try:
-            cls.conn = mysql.connector.connect(
-                host=host,
-                port=port,
-                user=user,
-                password=password,
-                database=database
-            )
-            cls.cursor = cls.conn.cursor()
+            with cls._phase('connect'):
+                conn = mysql.connector.connect(
+                    host=host,
+                    port=port,
+                    user=user,
+                    password=password,
+                    database=database
+                )
             logger.info('Connected to the database.')
+            return conn
         except Error as error:
             raise Exception(f'DB.connect.error: {error}') from error
     
     @classmethod
-    def close(cls) -> None:
-        """Close the database connection."""
+    def close(cls, conn: mysql.connector.MySQLConnection) -> None:
+        """Close a database connection."""
         try:
-            if cls.cursor:
-                cls.cursor.close()
-            if cls.conn:
-                cls.conn.close()
+            conn.close()
             logger.info('Connection closed.')
         except Error as error:
             logger.info(f'DB.close.error: {error}')
+
+    @classmethod
+    @contextmanager
+    def connection(cls) -> Iterator[mysql.connector.MySQLConnection]:
+        """
+        Context manager that checks out a pooled, transactional or dedicated connection for the current caller.
+        """
+        tx = cls._activeTransaction()
+        if tx is not None:
+            yield tx.conn
+            return
+
+        pool = cls._pool
+        if pool is None:
+            conn = cls.connect()
+            try:
+                yield conn
+            finally:
+                cls.close(conn)
+            return
+
+        with cls._phase('acquire'):
+            conn = pool.acquire()
+        discard = False
+        try:
+            yield conn
+        finally:
+            try:
+                if conn.unread_result:
+                    discard = True
+                elif conn.in_transaction:
+                    conn.rollback()
+            except Error:
+                discard = True
+            pool.release(conn, discard=discard)
+
+    @classmethod
+    @contextmanager
+    def transaction(cls) -> Iterator[Transaction]:
+        """
+        Run several operations on one connection and commit them together; nested blocks use savepoints.
+
+        Example Usage:
+        with DB.transaction() as tx:
+            tx.add_row('users', {'name': 'Alice', 'age': 30})
+            tx.update_row('users', {'age': 31}, {'name': 'Bob'})
+            with DB.transaction():
+                tx.delete_row('users', {'id': 7})
+        """
+        tx = cls._activeTransaction()
+        if tx is not None:
+            with tx.savepoint():
+                yield tx
+            return
+
+        with cls._instrument('transaction', ''), cls.connection() as conn:
+            tx = None
+            try:
+                conn.start_transaction()
+                tx = Transaction(cls, conn)
+                cls._local.transaction = tx
+                try:
+                    yield tx
+                except BaseException:
+                    conn.rollback()
+                    raise
+                with cls._phase('commit'):
+                    conn.commit()
+            except Error as error:
+                raise Exception(f'DB.transaction.error: {error}') from error
+            finally:
+                cls._local.transaction = None
+                if tx is not None:
+                    for table_name in tx.touched:
+                        cls._invalidate(table_name)
+
+    @classmethod
+    def _activeTransaction(cls) -> Transaction | None:
+        return getattr(cls._local, 'transaction', None)
+
+    @classmethod
+    def _commit(cls, conn: mysql.connector.MySQLConnection, table_name: str) -> None:
+        """
+        Commit a write to `table_name` and invalidate its cached reads, deferring both inside a transaction.
+        """
+        tx = cls._activeTransaction()
+        if tx is None:
+            with cls._phase('commit'):
+                conn.commit()
+        else:
+            tx.touched.add(table_name)
+        cls._invalidate(table_name)
+
+    @classmethod
+    def configureCache(cls, max_entries: int = 1024, ttl: float = 60.0) -> None:
+        """
+        Enable the read-through cache for `get_rows` and `get_row_as_dict`, invalidated by writes to the same table.
+
+        Example Usage:
+        DB.configureCache(max_entries=5000, ttl=30)
+        """
+        cls._cache = QueryCache(max_entries=max_entries, ttl=ttl)
+
+    @classmethod
+    def disableCache(cls) -> None:
+        """Disable the read-through cache."""
+        cls._cache = None
+
+    @classmethod
+    def clearCache(cls) -> None:
+        """Drop all cached results and reset the counters."""
+        if cls._cache:
+            cls._cache.clear()
+
+    @classmethod
+    def cacheStats(cls) -> dict | None:
+        """Return the cache counters, or None when caching is disabled."""
+        return cls._cache.stats() if cls._cache else None
+
+    @classmethod
+    def _invalidate(cls, table_name: str) -> None:
+        if cls._cache:
+            cls._cache.invalidate(table_name)
+
+    @classmethod
+    def _cachedRead(cls, operation: str, table_name: str, query: str, params: tuple, load: Callable[[], Any]) -> Any:
+        """Serve a read from the cache when enabled; reads inside a transaction always hit the database."""
+        cache = cls._cache
+        if cache is None or cls._activeTransaction() is not None:
+            return load()
+        return cache.getOrLoad(table_name, (operation, query, params), load)
+
+    @classmethod
+    def configureInstrumentation(cls, slow_query_threshold: float = None) -> None:
+        """
+        Start collecting per-operation/per-table timings and log calls slower than `slow_query_threshold`.
+
+        Example Usage:
+        DB.configureInstrumentation(slow_query_threshold=0.5)
+        ...
+        DB.queryStats()['get_rows:users']['latency']['p99']
+        """
+        cls._stats = QueryStats(slow_query_threshold=slow_query_threshold)
+
+    @classmethod
+    def disableInstrumentation(cls) -> None:
+        cls._stats = None
+
+    @classmethod
+    def queryStats(cls) -> dict:
+        """Return the collected stats keyed by 'operation:table' (empty when instrumentation is off)."""
+        return cls._stats.snapshot() if cls._stats else {}
+
+    @classmethod
+    def resetQueryStats(cls) -> None:
+        if cls._stats:
+            cls._stats.reset()
+
+    @classmethod
+    def dumpQueryStats(cls) -> None:
+        """Log one summary line per operation and table."""
+        for key, entry in sorted(cls.queryStats().items()):
+            latency = entry['latency']
+            phases = ', '.join(f'{phase}={elapsed * 1000:.1f}ms' for phase, elapsed in entry['phases'].items() if elapsed)
+            logger.info(
+                f'{key}: calls={entry["calls"]} errors={entry["errors"]} '
+                f'rows_affected={entry["rows_affected"]} rows_returned={entry["rows_returned"]} '
+                f'p50={latency["p50"] * 1000:.1f}ms p95={latency["p95"] * 1000:.1f}ms p99={latency["p99"] * 1000:.1f}ms '
+                f'({phases})'
+            )
+
+    @classmethod
+    @contextmanager
+    def _instrument(cls, operation: str, table_name: str) -> Iterator[OperationTimer | None]:
+        """Time one operation; phases recorded while it runs on this thread are attributed to it."""
+        stats = cls._stats
+        if stats is None:
+            yield None
+            return
+
+        timer = OperationTimer(operation, table_name)
+        stack = cls._local.__dict__.setdefault('operations', [])
+        stack.append(timer)
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield timer
+        except BaseException as error:
+            failed = not isinstance(error, GeneratorExit)
+            raise
+        finally:
+            stack.pop()
+            stats.record(timer, time.perf_counter() - start, failed)
+
+    @classmethod
+    @contextmanager
+    def _phase(cls, phase: str) -> Iterator[None]:
+        """Add the time spent in the block to `phase` of the current operation."""
+        timer = cls._currentOperation()
+        if timer is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timer.add(phase, time.perf_counter() - start)
+
+    @classmethod
+    @contextmanager
+    def _resumeOperation(cls, timer: OperationTimer) -> Iterator[None]:
+        """Make `timer` the current operation for one step of a streaming operation, adding the step's time to it."""
+        stack = cls._local.__dict__.setdefault('operations', [])
+        stack.append(timer)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timer.seconds += time.perf_counter() - start
+            stack.remove(timer)
+
+    @classmethod
+    def _currentOperation(cls) -> OperationTimer | None:
+        if cls._stats is None:
+            return None
+        stack = getattr(cls._local, 'operations', None)
+        return stack[-1] if stack else None
+
+    @classmethod
+    def _execute(cls, cursor: Any, query: str, params: tuple = ()) -> None:
+        """Execute `query` on `cursor`, timing it and counting affected rows."""
+        timer = cls._currentOperation()
+        if timer is None:
+            cursor.execute(query, params)
+            return
+        start = time.perf_counter()
+        cursor.execute(query, params)
+        timer.add('execute', time.perf_counter() - start)
+        timer.sql = query
+        if not query.startswith('SELECT') and cursor.rowcount > 0:
+            timer.rows_affected += cursor.rowcount
+
+    @classmethod
+    def _fetch(cls, cursor: Any, size: int = None) -> list:
+        """`fetchall()` (or `fetchmany(size)`), timing it and counting returned rows."""
+        timer = cls._currentOperation()
+        if timer is None:
+            return cursor.fetchall() if size is None else cursor.fetchmany(size)
+        start = time.perf_counter()
+        rows = cursor.fetchall() if size is None else cursor.fetchmany(size)
+        timer.add('fetch', time.perf_counter() - start)
+        timer.rows_returned += len(rows)
+        return rows
+
+    @classmethod
+    @contextmanager
+    def _session(cls) -> Iterator[tuple]:
+        """Context manager yielding a (connection, cursor) pair."""
+        with cls.connection() as conn:
+            cursor = conn.cursor(buffered=True)
+            try:
+                yield conn, cursor
+            finally:
+                cursor.close()
     
     @classmethod
     @contextmanager
     def get_connection(cls) -> mysql.connector:
         """Context manager for handling database connection."""
-        cls.connect()
-        try:
-            yield cls.cursor
-        finally:
-            cls.close()
+        with cls._session() as (_, cursor):
+            yield cursor
 
     @classmethod
+    @instrumented('create_table')
     def create_table(cls, table_name: str, columns: dict) -> None:
         """
         Create a new table with specified columns.
@@ -92,17 +831,18 @@ class DB:
         columns = {'id': 'INT PRIMARY KEY AUTO_INCREMENT', 'name': 'TEXT', 'age': 'INT'}
         DB.create_table('users', columns)
         """
-        with cls.get_connection() as cursor:
+        with cls._session() as (conn, cursor):
             try:
                 col_defs = ', '.join(f'{col} {datatype}' for col, datatype in columns.items())
                 query = f'CREATE TABLE IF NOT EXISTS {table_name} ({col_defs})'
-                cursor.execute(query)
-                cls.conn.commit()
+                cls._execute(cursor, query)
+                cls._commit(conn, table_name)
                 logger.info(f'Table \'{table_name}\' created.')
             except Error as error:
                 raise Exception(f'DB.create_table.error: {error}') from error
 
     @classmethod
+    @instrumented('add_row')
     def add_row(cls, table_name: str, data: dict) -> None:
         """
         Insert a row into the table.
@@ -111,19 +851,314 @@ class DB:
         data = {'name': 'Alice', 'age': 30}
         DB.add_row('users', data)
         """
-        with cls.get_connection() as cursor:
+        with cls._session() as (conn, cursor):
             try:
-                cols = ', '.join(data.keys())
-                placeholders = ', '.join(['%s'] * len(data))
-                query = f'INSERT INTO {table_name} ({cols}) VALUES ({placeholders})'
-                cursor.execute(query, tuple(data.values()))
-                cls.conn.commit()
+                query = cls._insertQuery(table_name, tuple(data.keys()))
+                cls._execute(cls._statementCursor(conn, cursor, query), query, tuple(data.values()))
+                cls._commit(conn, table_name)
                 logger.info(f'Row added to \'{table_name}\'.')
             except Error as error:
                 raise Exception(f'DB.add_row.error: {error}') from error
 
     @classmethod
-    def get_rows(cls, table_name: str, conditions: dict = None) -> list:
+    @instrumented('add_rows')
+    def add_rows(cls, table_name: str, rows: Iterable[dict], chunk_size: int = 1000, max_packet_bytes: int = None) -> list:
+        """
+        Insert many rows using chunked multi-row INSERT statements, returning per-chunk stats.
+
+        Example Usage:
+        rows = ({'name': f'user{i}', 'age': i % 90} for i in range(100_000))
+        DB.add_rows('users', rows, chunk_size=5000)
+        """
+        results = cls._insertChunks('add_rows', table_name, rows, chunk_size, max_packet_bytes, partial(cls._insertQuery, table_name))
+        logger.info(f'{sum(chunk["rows"] for chunk in results)} row(s) added to \'{table_name}\' in {len(results)} chunk(s).')
+        return results
+
+    @classmethod
+    @instrumented('upsert_rows')
+    def upsert_rows(cls, table_name: str, rows: Iterable[dict], key_columns: Iterable[str], chunk_size: int = 1000, max_packet_bytes: int = None) -> list:
+        """
+        Insert rows in chunks, updating the non-key columns when `key_columns` collide.
+
+        Example Usage:
+        DB.upsert_rows('prices', feed_rows, key_columns=['sku'], chunk_size=2000)
+        """
+        key_columns = frozenset(cls._normalizeColumns(key_columns))
+        if not key_columns:
+            raise ValueError('DB.upsert_rows.error: key_columns must not be empty')
+
+        def build_query(columns: tuple, row_count: int) -> str:
+            return cls._upsertQuery(table_name, columns, row_count, key_columns)
+
+        results = cls._insertChunks('upsert_rows', table_name, rows, chunk_size, max_packet_bytes, build_query)
+        logger.info(f'{sum(chunk["rows"] for chunk in results)} row(s) upserted into \'{table_name}\' in {len(results)} chunk(s).')
+        return results
+
+    @classmethod
+    @instrumented('update_rows')
+    def update_rows(cls, table_name: str, rows: Iterable[dict], key_column: str, chunk_size: int = 500) -> list:
+        """
+        Update many rows identified by `key_column`, one CASE/IN statement and commit per chunk.
+
+        Example Usage:
+        DB.update_rows('users', [{'id': 1, 'age': 31}, {'id': 2, 'age': 45}], key_column='id')
+        """
+        if chunk_size < 1:
+            raise ValueError(f'DB.update_rows.error: chunk_size must be positive, got {chunk_size}')
+
+        results = []
+        with cls._session() as (conn, cursor):
+            try:
+                def flush(columns, chunk):
+                    start = time.perf_counter()
+                    keys = [row[key_column] for row in chunk]
+                    values = [tuple(row[col] for col in columns) for row in chunk]
+                    if all(value == values[0] for value in values):
+                        query = cls._updateInQuery(table_name, columns, key_column, len(chunk))
+                        params = values[0] + tuple(keys)
+                    else:
+                        query = cls._updateCaseQuery(table_name, columns, key_column, len(chunk))
+                        params = tuple(param for index in range(len(columns)) for key, value in zip(keys, values) for param in (key, value[index]))
+                        params += tuple(keys)
+                    cls._execute(cursor, query, params)
+                    affected = cursor.rowcount
+                    cls._commit(conn, table_name)
+                    results.append({'rows': len(chunk), 'affected': affected, 'seconds': time.perf_counter() - start})
+
+                columns, chunk = None, []
+                for row in rows:
+                    row_columns = tuple(col for col in row.keys() if col != key_column)
+                    if chunk and (row_columns != columns or len(chunk) >= chunk_size):
+                        flush(columns, chunk)
+                        chunk = []
+                    columns = row_columns
+                    chunk.append(row)
+                if chunk:
+                    flush(columns, chunk)
+
+                logger.info(f'{sum(chunk["rows"] for chunk in results)} row(s) updated in \'{table_name}\' in {len(results)} chunk(s).')
+                return results
+            except Error as error:
+                raise Exception(f'DB.update_rows.error: {error} (after {len(results)} committed chunk(s))') from error
+
+    @classmethod
+    @instrumented('delete_rows')
+    def delete_rows(cls, table_name: str, key_column: str, keys: Iterable[Any], chunk_size: int = 1000) -> list:
+        """
+        Delete rows whose `key_column` is in `keys`, using chunked `DELETE ... WHERE key IN (...)`.
+
+        Example Usage:
+        DB.delete_rows('sessions', 'id', expired_ids, chunk_size=5000)
+        """
+        if chunk_size < 1:
+            raise ValueError(f'DB.delete_rows.error: chunk_size must be positive, got {chunk_size}')
+
+        results = []
+        with cls._session() as (conn, cursor):
+            try:
+                keys = iter(keys)
+                while True:
+                    chunk = tuple(islice(keys, chunk_size))
+                    if not chunk:
+                        break
+                    start = time.perf_counter()
+                    cls._execute(cursor, cls._deleteInQuery(table_name, key_column, len(chunk)), chunk)
+                    affected = cursor.rowcount
+                    cls._commit(conn, table_name)
+                    results.append({'rows': len(chunk), 'affected': affected, 'seconds': time.perf_counter() - start})
+
+                logger.info(f'{sum(chunk["affected"] for chunk in results)} row(s) deleted from \'{table_name}\' in {len(results)} chunk(s).')
+                return results
+            except Error as error:
+                raise Exception(f'DB.delete_rows.error: {error} (after {len(results)} committed chunk(s))') from error
+
+    @classmethod
+    def _insertChunks(cls, operation: str, table_name: str, rows: Iterable[dict], chunk_size: int, max_packet_bytes: int, build_query: Callable[[tuple, int], str]) -> list:
+        """
+        Group `rows` into multi-row statements built by `build_query(columns, row_count)` and commit each chunk.
+        """
+        if chunk_size < 1:
+            raise ValueError(f'DB.{operation}.error: chunk_size must be positive, got {chunk_size}')
+
+        results = []
+        with cls._session() as (conn, cursor):
+            try:
+                if max_packet_bytes is None:
+                    cursor.execute('SELECT @@max_allowed_packet')
+                    max_packet_bytes = int(cursor.fetchone()[0])
+                budget = int(max_packet_bytes * 0.9)  # Headroom for protocol overhead and escaping
+
+                def flush(columns, params, count):
+                    start = time.perf_counter()
+                    cls._execute(cursor, build_query(columns, count), params)
+                    affected = cursor.rowcount
+                    cls._commit(conn, table_name)
+                    results.append({'rows': count, 'affected': affected, 'seconds': time.perf_counter() - start})
+
+                columns, params, count, size = None, [], 0, 0
+                for row in rows:
+                    row_columns = tuple(row.keys())
+                    row_size = sum(cls._estimateSize(value) for value in row.values()) + 4 * len(row)
+                    if count and (row_columns != columns or count >= chunk_size or size + row_size > budget):
+                        flush(columns, params, count)
+                        params, count, size = [], 0, 0
+                    if not count:
+                        columns = row_columns
+                        size = len(build_query(columns, 1))
+                    params.extend(row.values())
+                    count += 1
+                    size += row_size
+                if count:
+                    flush(columns, params, count)
+                return results
+            except Error as error:
+                raise Exception(f'DB.{operation}.error: {error} (after {len(results)} committed chunk(s))') from error
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _insertQuery(table_name: str, columns: tuple, row_count: int = 1) -> str:
+        """Build (once per shape) an INSERT statement with `row_count` placeholder groups for `columns`."""
+        cols = ', '.join(columns)
+        placeholders = '(' + ', '.join(['%s'] * len(columns)) + ')'
+        return f'INSERT INTO {table_name} ({cols}) VALUES ' + ', '.join([placeholders] * row_count)
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _upsertQuery(cls, table_name: str, columns: tuple, row_count: int, key_columns: frozenset) -> str:
+        """Build (once per shape) a multi-row INSERT ... ON DUPLICATE KEY UPDATE statement."""
+        updates = [col for col in columns if col not in key_columns] or [next(iter(key_columns))]
+        update_str = ', '.join(f'{col} = VALUES({col})' for col in updates)
+        return f'{cls._insertQuery(table_name, columns, row_count)} ON DUPLICATE KEY UPDATE {update_str}'
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _updateInQuery(table_name: str, update_columns: tuple, key_column: str, key_count: int) -> str:
+        """Build (once per shape) an UPDATE applying the same values to every key in an IN list."""
+        update_str = ', '.join(f'{col} = %s' for col in update_columns)
+        return f'UPDATE {table_name} SET {update_str} WHERE {key_column} IN ({", ".join(["%s"] * key_count)})'
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _updateCaseQuery(table_name: str, update_columns: tuple, key_column: str, key_count: int) -> str:
+        """Build (once per shape) a CASE-based UPDATE giving each key its own values."""
+        cases = ' '.join(['WHEN %s THEN %s'] * key_count)
+        update_str = ', '.join(f'{col} = CASE {key_column} {cases} ELSE {col} END' for col in update_columns)
+        return f'UPDATE {table_name} SET {update_str} WHERE {key_column} IN ({", ".join(["%s"] * key_count)})'
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _deleteInQuery(table_name: str, key_column: str, key_count: int) -> str:
+        """Build (once per shape) a DELETE for an IN list of keys."""
+        return f'DELETE FROM {table_name} WHERE {key_column} IN ({", ".join(["%s"] * key_count)})'
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _updateQuery(table_name: str, update_columns: tuple, condition_columns: tuple) -> str:
+        """Build (once per shape) an UPDATE statement for equality conditions."""
+        update_str = ', '.join(f'{col} = %s' for col in update_columns)
+        cond_str = ' AND '.join(f'{col} = %s' for col in condition_columns)
+        return f'UPDATE {table_name} SET {update_str} WHERE {cond_str}'
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _deleteQuery(table_name: str, condition_columns: tuple) -> str:
+        """Build (once per shape) a DELETE statement for equality conditions."""
+        cond_str = ' AND '.join(f'{col} = %s' for col in condition_columns)
+        return f'DELETE FROM {table_name} WHERE {cond_str}'
+
+    @classmethod
+    def _selectQuery(cls, table_name: str, conditions: dict = None, columns: Iterable[str] = None, order_by: str | Iterable[str] = None, limit: int = None, offset: int = None, seek: tuple = None) -> tuple:
+        """
+        Build a SELECT statement and its parameters; `seek` is an optional (column, op, value) keyset condition.
+        """
+        if offset is not None and limit is None:
+            raise ValueError('DB._selectQuery.error: offset requires limit')
+        if seek is not None and seek[1] not in ('>', '<'):
+            raise ValueError(f'DB._selectQuery.error: invalid seek operator {seek[1]!r}')
+        # Sorted so the same conditions in any dict order share one statement, cache entry and prepared statement
+        conditions = dict(sorted(conditions.items(), key=lambda item: item[0])) if conditions else None
+        query = cls._selectSql(
+            table_name,
+            tuple(conditions.keys()) if conditions else (),
+            cls._normalizeColumns(columns),
+            cls._normalizeColumns(order_by),
+            limit is not None,
+            offset is not None,
+            seek[:2] if seek is not None else None
+        )
+        params = tuple(conditions.values()) if conditions else ()
+        if seek is not None:
+            params += (seek[2],)
+        if limit is not None:
+            params += (int(limit),)
+        if offset is not None:
+            params += (int(offset),)
+        return query, params
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _selectSql(table_name: str, condition_columns: tuple, columns: tuple, order_by: tuple, has_limit: bool, has_offset: bool, seek: tuple = None) -> str:
+        """Build (once per shape) the SELECT statement text."""
+        query = f'SELECT {", ".join(columns) if columns else "*"} FROM {table_name}'
+        where = [f'{col} = %s' for col in condition_columns]
+        if seek is not None:
+            where.append(f'{seek[0]} {seek[1]} %s')
+        if where:
+            query += ' WHERE ' + ' AND '.join(where)
+        if order_by:
+            query += ' ORDER BY ' + ', '.join(order_by)
+        if has_limit:
+            query += ' LIMIT %s'
+        if has_offset:
+            query += ' OFFSET %s'
+        return query
+
+    @staticmethod
+    def _normalizeColumns(columns: str | Iterable[str] | None) -> tuple:
+        if not columns:
+            return ()
+        if isinstance(columns, str):
+            return (columns,)
+        return tuple(columns)
+
+    @classmethod
+    def _statementCursor(cls, conn: mysql.connector.MySQLConnection, cursor: Any, query: str) -> Any:
+        """
+        Return the cursor to execute `query` with, a prepared statement on pooled connections.
+        """
+        if cls._pool is None:
+            return cursor
+        with cls._prepared_lock:
+            statements = cls._prepared.get(conn)
+            if statements is None:
+                statements = cls._prepared[conn] = OrderedDict()
+            prepared = statements.get(query)
+            if prepared is not None:
+                statements.move_to_end(query)
+                return prepared
+            prepared = statements[query] = conn.cursor(prepared=True)
+            evicted = statements.popitem(last=False)[1] if len(statements) > cls.max_prepared_statements else None
+        if evicted is not None:
+            try:
+                evicted.close()  # Deallocates the server-side statement
+            except Error:
+                pass
+        return prepared
+
+    @staticmethod
+    def _estimateSize(value: Any) -> int:
+        """Rough upper bound of the bytes a parameter occupies in the rendered statement."""
+        if value is None:
+            return 4
+        if isinstance(value, (bytes, bytearray)):
+            return 2 * len(value) + 3  # Worst case with every byte escaped
+        if isinstance(value, str):
+            return 4 * len(value) + 2  # utf8mb4, quoted
+        return len(str(value)) + 2
+
+    @classmethod
+    @instrumented('get_rows')
+    def get_rows(cls, table_name: str, conditions: dict = None, columns: Iterable[str] = None, order_by: str | Iterable[str] = None, limit: int = None, offset: int = None) -> list:
         """
         Fetch rows from the table, with optional conditions.
 
@@ -134,24 +1169,353 @@ class DB:
         # Fetch rows with conditions
         conditions = {'age': 30}
         DB.get_rows('users', conditions)
+
+        # Fetch selected columns of the ten oldest users
+        DB.get_rows('users', columns=['id', 'name'], order_by='age DESC', limit=10)
         """
-        with cls.get_connection() as cursor:
+        query, params = cls._selectQuery(table_name, conditions, columns, order_by, limit, offset)
+
+        def load() -> list:
+            with cls._session() as (conn, cursor):
+                try:
+                    statement = cls._statementCursor(conn, cursor, query)
+                    cls._execute(statement, query, params)
+
+                    result = cls._fetch(statement)
+                    return result
+                except Error as error:
+                    logger.info(f'DB.get_rows.error: {error}')
+                    return None
+
+        return cls._cachedRead('get_rows', table_name, query, params, load)
+
+    @classmethod
+    @instrumented('iter_rows')
+    def iter_rows(cls, table_name: str, conditions: dict = None, batch_size: int = 1000, columns: Iterable[str] = None, order_by: str | Iterable[str] = None, limit: int = None, offset: int = None) -> Iterator[tuple]:
+        """
+        Stream rows from the table in `fetchmany(batch_size)` batches without materializing the full result.
+
+        Example Usage:
+        for row in DB.iter_rows('users', {'age': 30}, batch_size=5000):
+            process(row)
+        """
+        query, params = cls._selectQuery(table_name, conditions, columns, order_by, limit, offset)
+        for batch in cls._iterBatches(query, params, batch_size):
+            yield from batch[1]
+
+    @classmethod
+    @instrumented('iter_rows_as_dict')
+    def iter_rows_as_dict(cls, table_name: str, conditions: dict = None, batch_size: int = 1000, columns: Iterable[str] = None, order_by: str | Iterable[str] = None, limit: int = None, offset: int = None) -> Iterator[dict]:
+        """
+        Stream rows from the table as dictionaries keyed by column name.
+
+        Example Usage:
+        for user in DB.iter_rows_as_dict('users', batch_size=5000):
+            print(user['name'])
+        """
+        query, params = cls._selectQuery(table_name, conditions, columns, order_by, limit, offset)
+        names = None
+        for description, batch in cls._iterBatches(query, params, batch_size):
+            if names is None:
+                names = tuple(col[0] for col in description)  # Computed once per query
+            for row in batch:
+                yield dict(zip(names, row))
+
+    @classmethod
+    @instrumented('get_columns')
+    def get_columns(cls, table_name: str, conditions: dict = None, columns: Iterable[str] = None, order_by: str | Iterable[str] = None, limit: int = None, batch_size: int = 10000) -> dict:
+        """
+        Fetch rows column-wise into NumPy arrays typed from `cursor.description` (requires numpy).
+
+        Example Usage:
+        data = DB.get_columns('measurements', {'sensor': 'a1'}, columns=['ts', 'value'])
+        data['value'].mean()
+        """
+        if np is None:
+            raise ImportError('DB.get_columns requires numpy: pip install numpy')
+
+        query, params = cls._selectQuery(table_name, conditions, columns, order_by, limit)
+        names, buffers, count = None, None, 0
+        for description, batch in cls._iterBatches(query, params, batch_size):
+            if buffers is None:
+                names = [col[0] for col in description]
+                buffers = [np.empty(max(batch_size, len(batch)), dtype=cls._numpyDtype(col)) for col in description]
+            size = len(batch)
+            if count + size > len(buffers[0]):
+                capacity = max(2 * len(buffers[0]), count + size)
+                for buffer in buffers:
+                    buffer.resize(capacity, refcheck=False)
+            for index, buffer in enumerate(buffers):
+                buffer[count:count + size] = [row[index] for row in batch]
+            count += size
+
+        if buffers is None:
+            # No rows: describe the result without fetching anything
+            with cls._session() as (conn, cursor):
+                cls._execute(cursor, *cls._selectQuery(table_name, conditions, columns, order_by, limit=0))
+                cls._fetch(cursor)
+                return {col[0]: np.empty(0, dtype=cls._numpyDtype(col)) for col in cursor.description}
+
+        for buffer in buffers:
+            buffer.resize(count, refcheck=False)  # Trim the spare capacity in place
+        return dict(zip(names, buffers))
+
+    @classmethod
+    @instrumented('paginate')
+    def paginate(cls, table_name: str, key_column: str, page_size: int = 1000, conditions: dict = None, columns: Iterable[str] = None, cursor: str = None, descending: bool = False) -> Iterator[Page]:
+        """
+        Lazily page through a table with keyset pagination on a unique, indexed `key_column`.
+
+        Example Usage:
+        for page in DB.paginate('events', 'id', page_size=5000, cursor=load_checkpoint()):
+            process(page.rows)
+            save_checkpoint(page.cursor)
+        """
+        if page_size < 1:
+            raise ValueError(f'DB.paginate.error: page_size must be positive, got {page_size}')
+        columns = cls._normalizeColumns(columns)
+        if columns and key_column not in columns:
+            raise ValueError(f'DB.paginate.error: columns must include the key column \'{key_column}\'')
+
+        last_key = cls._decodePageCursor(cursor, table_name, key_column, descending) if cursor else None
+        operator = '<' if descending else '>'
+        order_by = f'{key_column} DESC' if descending else key_column
+
+        while True:
+            seek = (key_column, operator, last_key) if last_key is not None else None
+            query, params = cls._selectQuery(table_name, conditions, columns, order_by, limit=page_size, seek=seek)
+            with cls._session() as (conn, db_cursor):
+                try:
+                    statement = cls._statementCursor(conn, db_cursor, query)
+                    cls._execute(statement, query, params)
+                    rows = cls._fetch(statement)
+                    key_index = [col[0] for col in statement.description].index(key_column)
+                except Error as error:
+                    raise Exception(f'DB.paginate.error: {error}') from error
+            if not rows:
+                return
+
+            last_key = rows[-1][key_index]
+            cursor = cls._encodePageCursor(table_name, key_column, last_key, descending)
+            yield Page(rows, cursor)
+            if len(rows) < page_size:
+                return
+
+    @staticmethod
+    def _encodePageCursor(table_name: str, key_column: str, value: Any, descending: bool = False) -> str:
+        """Serialize the last key of a page and the scan direction into an opaque, URL-safe resume token."""
+        if isinstance(value, datetime):
+            value = {'datetime': value.isoformat()}
+        elif isinstance(value, date):
+            value = {'date': value.isoformat()}
+        elif isinstance(value, Decimal):
+            value = {'decimal': str(value)}
+        elif isinstance(value, (bytes, bytearray)):
+            value = {'bytes': base64.b64encode(value).decode()}
+        payload = json.dumps({'table': table_name, 'key': key_column, 'desc': descending, 'value': value}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def _decodePageCursor(cursor: str, table_name: str, key_column: str, descending: bool = False) -> Any:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except ValueError as error:
+            raise ValueError(f'DB.paginate.error: malformed cursor: {error}') from error
+        if not isinstance(payload, dict) or 'value' not in payload:
+            raise ValueError('DB.paginate.error: malformed cursor: not a DB.paginate token')
+        if payload.get('table') != table_name or payload.get('key') != key_column:
+            raise ValueError(f'DB.paginate.error: cursor belongs to {payload.get("table")}.{payload.get("key")}, not {table_name}.{key_column}')
+        if bool(payload.get('desc', False)) != descending:
+            raise ValueError(f'DB.paginate.error: cursor was created with descending={bool(payload.get("desc", False))}, not descending={descending}')
+
+        value = payload['value']
+        if isinstance(value, dict):
+            if 'datetime' in value:
+                return datetime.fromisoformat(value['datetime'])
+            if 'date' in value:
+                return date.fromisoformat(value['date'])
+            if 'decimal' in value:
+                return Decimal(value['decimal'])
+            if 'bytes' in value:
+                return base64.b64decode(value['bytes'])
+        return value
+
+    @classmethod
+    @instrumented('export_table')
+    def export_table(cls, table_name: str, path: str, format: str = 'csv', conditions: dict = None, batch_size: int = 10000, columns: Iterable[str] = None, compression: str = None) -> dict:
+        """
+        Stream a table to a CSV, JSONL or Parquet file with memory bounded by `batch_size`.
+
+        Example Usage:
+        DB.export_table('events', 'exports/events.jsonl.gz', format='jsonl', compression='gzip')
+        DB.export_table('events', 'exports/events.parquet', format='parquet', batch_size=50000)
+        """
+        if format not in ('csv', 'jsonl', 'parquet'):
+            raise ValueError(f'DB.export_table.error: unsupported format {format!r}')
+        if format == 'parquet' and pq is None:
+            raise ImportError('DB.export_table requires pyarrow for parquet: pip install pyarrow')
+        if format != 'parquet' and compression not in (None, 'gzip', 'bz2', 'xz'):
+            raise ValueError(f'DB.export_table.error: unsupported compression {compression!r}')
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        start = time.perf_counter()
+        query, params = cls._selectQuery(table_name, conditions, columns)
+        batches = cls._iterBatches(query, params, batch_size, describe_empty=True)  # Empty results still get a header / schema
+        rows = 0
+        try:
+            if format == 'parquet':
+                rows = cls._writeParquet(batches, tmp_path, compression)
+            else:
+                opener = {None: open, 'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}[compression]
+                with opener(tmp_path, 'wt', encoding='utf-8', newline='') as f:
+                    rows = cls._writeCsv(batches, f) if format == 'csv' else cls._writeJsonl(batches, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            batches.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        seconds = time.perf_counter() - start
+        written = os.path.getsize(path)
+        logger.info(f'Exported {rows} row(s) from \'{table_name}\' to {path} ({written} bytes, {rows / seconds if seconds else 0:.0f} rows/s).')
+        return {'rows': rows, 'bytes': written, 'seconds': seconds, 'rows_per_sec': rows / seconds if seconds else 0.0, 'path': path}
+
+    @classmethod
+    def _writeCsv(cls, batches: Iterator[tuple], f: Any) -> int:
+        writer = csv.writer(f)
+        rows, header = 0, False
+        for description, batch in batches:
+            if not header:
+                writer.writerow(col[0] for col in description)
+                header = True
+            writer.writerows([cls._exportText(value) if isinstance(value, (set, frozenset, bytes, bytearray)) else value for value in row] for row in batch)
+            rows += len(batch)
+        return rows
+
+    @classmethod
+    def _writeJsonl(cls, batches: Iterator[tuple], f: Any) -> int:
+        encoder = json.JSONEncoder(default=cls._exportText, ensure_ascii=False, separators=(',', ':'))
+        rows, names = 0, None
+        for description, batch in batches:
+            if names is None:
+                names = [col[0] for col in description]
+            f.write(''.join(encoder.encode(dict(zip(names, row))) + '\n' for row in batch))
+            rows += len(batch)
+        return rows
+
+    @classmethod
+    def _writeParquet(cls, batches: Iterator[tuple], path: str, compression: str = None) -> int:
+        writer, schema, rows = None, None, 0
+        try:
+            for description, batch in batches:
+                if writer is None:
+                    schema = pa.schema([(col[0], cls._arrowType(col)) for col in description])
+                    writer = pq.ParquetWriter(path, schema, compression=compression or 'snappy')
+                if not batch:
+                    continue  # Empty result: the writer still produces a valid file with the schema
+                arrays = []
+                for index, field in enumerate(schema):
+                    values = [row[index] for row in batch]
+                    if pa.types.is_string(field.type):
+                        values = [value if value is None or isinstance(value, str) else cls._exportText(value) for value in values]
+                    arrays.append(pa.array(values, type=field.type))
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))  # One row group per batch
+                rows += len(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    @staticmethod
+    def _arrowType(description: tuple) -> Any:
+        """Map a `cursor.description` entry to a pyarrow type."""
+        type_code = description[1]
+        if type_code in (FieldType.TINY, FieldType.SHORT, FieldType.INT24, FieldType.LONG, FieldType.LONGLONG, FieldType.YEAR):
+            unsigned = len(description) > 7 and description[7] & FieldFlag.UNSIGNED
+            return pa.uint64() if unsigned and type_code == FieldType.LONGLONG else pa.int64()
+        if type_code in (FieldType.FLOAT, FieldType.DOUBLE):
+            return pa.float64()
+        if type_code in (FieldType.DATE, FieldType.NEWDATE):
+            return pa.date32()
+        if type_code in (FieldType.DATETIME, FieldType.TIMESTAMP):
+            return pa.timestamp('us')
+        if type_code == FieldType.TIME:
+            return pa.duration('us')
+        if type_code == FieldType.BIT:
+            return pa.uint64()
+        if type_code in (FieldType.DECIMAL, FieldType.NEWDECIMAL):
+            precision, scale = description[4:6] if len(description) > 5 else (None, None)
+            if precision and scale is not None and precision <= 38:
+                return pa.decimal128(precision, scale)
+            return pa.string()  # mysql-connector leaves precision/scale unset; kept exact as text
+        if type_code in (FieldType.TINY_BLOB, FieldType.MEDIUM_BLOB, FieldType.LONG_BLOB, FieldType.BLOB, FieldType.VARCHAR, FieldType.VAR_STRING, FieldType.STRING):
+            binary = len(description) > 8 and description[8] == 63  # 'binary' charset: BLOB/VARBINARY; TEXT columns report BLOB too
+            return pa.binary() if binary else pa.string()
+        return pa.string()  # VARCHAR, CHAR, JSON, ENUM, SET, ...
+
+    @staticmethod
+    def _exportText(value: Any) -> str:
+        """Render a non-str value (Decimal, SET, bytes, ...) as text for CSV, JSONL and Parquet string columns."""
+        if isinstance(value, (set, frozenset)):
+            return ','.join(sorted(value))  # MySQL's own SET notation, in a stable order
+        if isinstance(value, (bytes, bytearray)):
+            return base64.b64encode(value).decode('ascii')
+        return str(value)
+
+    @staticmethod
+    def _numpyDtype(description: tuple) -> str:
+        """Map a `cursor.description` entry to a NumPy dtype."""
+        type_code = description[1]
+        nullable = len(description) > 6 and description[6]
+        if type_code in (FieldType.TINY, FieldType.SHORT, FieldType.INT24, FieldType.LONG, FieldType.LONGLONG, FieldType.YEAR):
+            if nullable:
+                return 'float64'
+            unsigned = len(description) > 7 and description[7] & FieldFlag.UNSIGNED
+            return 'uint64' if unsigned and type_code == FieldType.LONGLONG else 'int64'
+        if type_code in (FieldType.FLOAT, FieldType.DOUBLE):
+            return 'float64'
+        if type_code in (FieldType.DATE, FieldType.NEWDATE):
+            return 'datetime64[D]'
+        if type_code in (FieldType.DATETIME, FieldType.TIMESTAMP):
+            return 'datetime64[us]'
+        if type_code == FieldType.TIME:
+            return 'timedelta64[us]'
+        return 'object'
+
+    @classmethod
+    def _iterBatches(cls, query: str, params: tuple, batch_size: int, describe_empty: bool = False) -> Iterator[tuple]:
+        """Yield (cursor.description, rows) per fetchmany batch from an unbuffered cursor; with `describe_empty`, an empty result yields (description, []) once."""
+        if batch_size < 1:
+            raise ValueError(f'DB.iter_rows.error: batch_size must be positive, got {batch_size}')
+
+        with cls.connection() as conn:
+            cursor = conn.cursor(buffered=False)
             try:
-                query = f'SELECT * FROM {table_name}'
-                if conditions:
-                    cond_str = ' AND '.join(f'{col} = %s' for col in conditions.keys())
-                    query += f' WHERE {cond_str}'
-                    cursor.execute(query, tuple(conditions.values()))
-                else:
-                    cursor.execute(query)
-
-                result = cursor.fetchall()
-                return result
+                cls._execute(cursor, query, params)
+                description = cursor.description
+                empty = True
+                while True:
+                    batch = cls._fetch(cursor, batch_size)
+                    if not batch:
+                        break
+                    empty = False
+                    yield description, batch
+                if empty and describe_empty:
+                    yield description, []
             except Error as error:
-                logger.info(f'DB.get_rows.error: {error}')
-                return None
+                raise Exception(f'DB.iter_rows.error: {error}') from error
+            finally:
+                try:
+                    if conn.unread_result and cls._activeTransaction() is not None:
+                        conn.consume_results()  # The transaction keeps using this connection
+                    cursor.close()
+                except Error:
+                    pass  # Unread rows after an early stop; the connection is discarded instead
 
     @classmethod
+    @instrumented('update_row')
     def update_row(cls, table_name: str, updates: dict, conditions: dict) -> None:
         """
         Update rows in the table with specific conditions.
@@ -161,18 +1525,17 @@ class DB:
         conditions = {'id': 1}
         DB.update_row('users', updates, conditions)
         """
-        with cls.get_connection() as cursor:
+        with cls._session() as (conn, cursor):
             try:
-                update_str = ', '.join(f'{col} = %s' for col in updates.keys())
-                cond_str = ' AND '.join(f'{col} = %s' for col in conditions.keys())
-                query = f'UPDATE {table_name} SET {update_str} WHERE {cond_str}'
-                cursor.execute(query, tuple(updates.values()) + tuple(conditions.values()))
-                cls.conn.commit()
+                query = cls._updateQuery(table_name, tuple(updates.keys()), tuple(conditions.keys()))
+                cls._execute(cls._statementCursor(conn, cursor, query), query, tuple(updates.values()) + tuple(conditions.values()))
+                cls._commit(conn, table_name)
                 logger.info(f'Row(s) updated in \'{table_name}\'.')
             except Error as error:
                 raise Exception(f'DB.update_row.error: {error}') from error
 
     @classmethod
+    @instrumented('delete_row')
     def delete_row(cls, table_name: str, conditions: dict) -> None:
         """
         Delete rows from the table based on conditions.
@@ -181,47 +1544,49 @@ class DB:
         conditions = {'id': 1}
         DB.delete_row('users', conditions)
         """
-        with cls.get_connection() as cursor:
+        with cls._session() as (conn, cursor):
             try:
-                cond_str = ' AND '.join(f'{col} = %s' for col in conditions.keys())
-                query = f'DELETE FROM {table_name} WHERE {cond_str}'
-                cursor.execute(query, tuple(conditions.values()))
-                cls.conn.commit()
+                query = cls._deleteQuery(table_name, tuple(conditions.keys()))
+                cls._execute(cls._statementCursor(conn, cursor, query), query, tuple(conditions.values()))
+                cls._commit(conn, table_name)
                 logger.info(f'Row(s) deleted from \'{table_name}\'.')
             except Error as error:
                 raise Exception(f'DB.delete_row.error: {error}') from error
     
     @classmethod
-    def get_row_as_dict(cls, table_name: str, conditions: dict = None) -> dict | None:
+    @instrumented('get_row_as_dict')
+    def get_row_as_dict(cls, table_name: str, conditions: dict = None, columns: Iterable[str] = None, order_by: str | Iterable[str] = None) -> dict | None:
         """
         Fetch a single row from the table as a dictionary with column names.
         
         Example Usage:
         conditions = {'id': 1}
         DB.get_row_as_dict('users', conditions)
+        DB.get_row_as_dict('users', columns=['id', 'name'], order_by='created_at DESC')
         """
-        with cls.get_connection() as cursor:
-            try:
-                query = f'SELECT * FROM {table_name}'
-                if conditions:
-                    cond_str = ' AND '.join(f'{col} = %s' for col in conditions.keys())
-                    query += f' WHERE {cond_str}'
-                    cursor.execute(query, tuple(conditions.values()))
-                else:
-                    cursor.execute(query)
-
-                result = cursor.fetchone()
-                if result:
-                    # Fetch column names
-                    columns = [col[0] for col in cursor.description]
-                    # Map column names to result values
-                    return dict(zip(columns, result))
-                return None
-            except Error as error:
-                logger.error(f'DB.get_row_as_dict.error: {error}')
-                return None
+        query, params = cls._selectQuery(table_name, conditions, columns, order_by, limit=1)
+
+        def load() -> dict | None:
+            with cls._session() as (conn, cursor):
+                try:
+                    statement = cls._statementCursor(conn, cursor, query)
+                    cls._execute(statement, query, params)
+
+                    result = cls._fetch(statement)
+                    if result:
+                        # Fetch column names
+                        names = [col[0] for col in statement.description]
+                        # Map column names to result values
+                        return dict(zip(names, result[0]))
+                    return None
+                except Error as error:
+                    logger.error(f'DB.get_row_as_dict.error: {error}')
+                    return None
+
+        return cls._cachedRead('get_row_as_dict', table_name, query, params, load)
     
     @classmethod
+    @instrumented('add_column')
     def add_column(cls, table_name: str, column_name: str, column_datatype: str) -> None:
         """
         Add a new column to an existing table.
@@ -229,16 +1594,16 @@ class DB:
         Example Usage:
         DB.add_column('test', 'email', 'VARCHAR(255)')
         """
-        with cls.get_connection() as cursor:
+        with cls._session() as (conn, cursor):
             try:
                 query = f'ALTER TABLE {table_name} ADD COLUMN {column_name} {column_datatype}'
-                cursor.execute(query)
-                cls.conn.commit()
+                cls._execute(cursor, query)
+                cls._commit(conn, table_name)
                 logger.info(f'Column \'{column_name}\' added to \'{table_name}\' table.')
             except Error as error:
                 raise Exception(f'DB.add_column.error: {error}') from error
 
-# Example usage
+# Example usage (run from the repository root: python -m components.db)
 if __name__ == '__main__':
     # Only mysql admin user acc has grant access for CREATE.
     Env = 'DEV'
@@ -251,6 +1616,7 @@ if __name__ == '__main__':
         password=os.getenv(f'{Env}_DB_PASSWORD').encode(),
         database=os.getenv(f'{Env}_DB_DATABASE').encode()
     )
+    DB.configurePool(min_size=1, max_size=5)
 
     # Test database operations
     try:
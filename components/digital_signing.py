@@ -1,24 +1,226 @@
-from typing import Tuple
+import base64
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+import hashlib
+import json
+import os
+import time
+from typing import Callable, Iterable, NamedTuple, Tuple
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa, utils
 from cryptography.hazmat.backends import default_backend
 
+CHUNK_SIZE = 1024 * 1024
+MANIFEST_VERSION = 1
+MANIFEST_CONTEXT = b'DigitalSigning manifest v1\n'  # Prefixed to the signed root so it cannot double as a file signature
+
+RSA_PSS = 'rsa-pss'
+ED25519 = 'ed25519'
+ED25519_SHA256 = 'ed25519-sha256'  # Non-standard: Ed25519 over the SHA-256 digest of the data, used for streamed files
+ECDSA_P256 = 'ecdsa-p256'
+KEY_ALGORITHMS = (RSA_PSS, ED25519, ECDSA_P256)
+ALGORITHMS = (RSA_PSS, ED25519, ED25519_SHA256, ECDSA_P256)
+SIGNATURE_MAGIC = b'DSIG1:'  # Tagged signature file: magic + algorithm + b':' + signature. Untagged files are RSA-PSS.
+
+PrivateKey = rsa.RSAPrivateKey | ed25519.Ed25519PrivateKey | ec.EllipticCurvePrivateKey
+PublicKey = rsa.RSAPublicKey | ed25519.Ed25519PublicKey | ec.EllipticCurvePublicKey
+
+_PSS = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=padding.PSS.MAX_LENGTH
+)
+
+class VerifyResult(NamedTuple):
+    index: int
+    source: str | None  # File path, or None for in-memory data
+    valid: bool
+    error: str | None  # 'invalid signature', or why the item could not be checked
+
+def _keyAlgorithm(key: PrivateKey | PublicKey) -> str:
+    """ Returns the key's algorithm, which is also the algorithm of its signatures over data. """
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return RSA_PSS
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return ED25519
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)) and isinstance(key.curve, ec.SECP256R1):
+        return ECDSA_P256
+    raise ValueError(f'Unsupported key type: {type(key).__name__}')
+
+def _digestAlgorithm(key: PrivateKey | PublicKey) -> str:
+    """ Returns the algorithm of the key's signatures over a SHA-256 digest (signFile, verifyFile, verifyDigest). """
+    algorithm = _keyAlgorithm(key)
+    return ED25519_SHA256 if algorithm == ED25519 else algorithm
+
+def _keyMatches(key: PrivateKey | PublicKey, algorithm: str) -> bool:
+    """ Whether signatures tagged `algorithm` are made with this kind of key. """
+    return _keyAlgorithm(key) == (ED25519 if algorithm == ED25519_SHA256 else algorithm)
+
+def _signDigest(private_key: PrivateKey, digest: bytes) -> bytes:
+    """
+    Signs a SHA-256 digest. RSA-PSS and ECDSA sign it as a prehashed message, which matches signing the data itself.
+    Ed25519 has no prehashed mode here, so it signs the 32-byte digest as its message (ed25519-sha256).
+    """
+    algorithm = _keyAlgorithm(private_key)
+    if algorithm == RSA_PSS:
+        return private_key.sign(digest, _PSS, utils.Prehashed(hashes.SHA256()))
+    if algorithm == ECDSA_P256:
+        return private_key.sign(digest, ec.ECDSA(utils.Prehashed(hashes.SHA256())))
+    return private_key.sign(digest)
+
+def _verifyDigest(public_key: PublicKey, signature: bytes, digest: bytes) -> None:
+    """ Counterpart of _signDigest; raises InvalidSignature. """
+    algorithm = _keyAlgorithm(public_key)
+    if algorithm == RSA_PSS:
+        public_key.verify(signature, digest, _PSS, utils.Prehashed(hashes.SHA256()))
+    elif algorithm == ECDSA_P256:
+        public_key.verify(signature, digest, ec.ECDSA(utils.Prehashed(hashes.SHA256())))
+    else:
+        public_key.verify(signature, digest)
+
+def _signMessage(private_key: PrivateKey, data: bytes) -> bytes:
+    """ Signs data with the key's algorithm; Ed25519 signs the data itself, as standard verifiers expect. """
+    if _keyAlgorithm(private_key) == ED25519:
+        return private_key.sign(data)
+    return _signDigest(private_key, hashlib.sha256(data).digest())
+
+def _checkAlgorithm(public_key: PublicKey, algorithm: str | None) -> None:
+    """ Raises ValueError when signatures tagged `algorithm` cannot come from this kind of key. """
+    if algorithm is not None and not _keyMatches(public_key, algorithm):
+        raise ValueError(f'{algorithm} signature cannot be checked with a {_keyAlgorithm(public_key)} key')
+
+def _readSignature(path: str) -> Tuple[str | None, bytes]:
+    """ Returns (algorithm tag or None if untagged, signature) from a signature file. """
+    with open(path, 'rb') as f:
+        signature = f.read()
+    if not signature.startswith(SIGNATURE_MAGIC):
+        return None, signature
+    tag, _, signature = signature[len(SIGNATURE_MAGIC):].partition(b':')
+    return tag.decode(), signature
+
+def _resolveSignature(signature, algorithm: str = None) -> Tuple[bytes, str | None]:
+    """
+    Returns (signature bytes, algorithm) from signature bytes, an (algorithm, signature) pair from
+    loadSignatureFromFile(..., with_algorithm=True), or a signature file path, whose tag gives the algorithm.
+    """
+    tag = None
+    if isinstance(signature, (str, os.PathLike)):
+        tag, signature = _readSignature(signature)
+    elif isinstance(signature, tuple):
+        tag, signature = signature
+    if algorithm is not None and tag is not None and tag != algorithm:
+        raise ValueError(f'Signature is tagged {tag}, expected {algorithm}')
+    return signature, algorithm or tag
+
+def _verifyFileSignature(public_key: PublicKey, signature: bytes, path: str, algorithm: str = None, chunk_size: int = CHUNK_SIZE) -> None:
+    """
+    Checks a signature over a file's contents; raises InvalidSignature, or ValueError when `algorithm` does not fit the key.
+    Digest-form signatures (signFile) are checked in constant memory; an 'ed25519' one (signData) needs the whole file.
+    """
+    _checkAlgorithm(public_key, algorithm)
+    if algorithm == ED25519:
+        with open(path, 'rb') as f:
+            public_key.verify(signature, f.read())
+    else:
+        _verifyDigest(public_key, signature, DigitalSigning.hashFile(path, chunk_size))
+
+def _verifyMessage(public_key: PublicKey, signature: bytes, data: bytes, algorithm: str = None) -> None:
+    """ Counterpart of _signMessage; an Ed25519 key checks an ed25519-sha256 signature when `algorithm` says so. """
+    if _keyAlgorithm(public_key) == ED25519 and algorithm != ED25519_SHA256:
+        public_key.verify(signature, data)
+    else:
+        _verifyDigest(public_key, signature, hashlib.sha256(data).digest())
+
+def _rate(operation: Callable[[], object], seconds: float) -> float:
+    """ Runs an operation repeatedly for about `seconds` and returns operations per second. """
+    count, started = 0, time.perf_counter()
+    while True:
+        operation()
+        count += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            return count / elapsed
+
+_worker_public_key = None  # Set once per verifyMany worker process
+
+def _initVerifier(public_pem: bytes) -> None:
+    global _worker_public_key
+    _worker_public_key = serialization.load_pem_public_key(public_pem, backend=default_backend())
+
+def _verifyBatch(batch: list, public_key=None) -> list:
+    """ Hashes and verifies (index, source, signature, algorithm) items; runs inside a worker process. """
+    public_key = public_key or _worker_public_key
+    results = []
+    for index, source, signature, algorithm in batch:
+        path = os.fspath(source) if isinstance(source, (str, os.PathLike)) else None
+        try:
+            signature, algorithm = _resolveSignature(signature, algorithm)
+            if path is not None:
+                _verifyFileSignature(public_key, signature, path, algorithm)
+            else:
+                _checkAlgorithm(public_key, algorithm)
+                _verifyMessage(public_key, signature, source, algorithm)
+            results.append(VerifyResult(index, path, True, None))
+        except InvalidSignature:
+            if path is not None and algorithm is None and _keyAlgorithm(public_key) == ED25519:
+                # The usual mix-up: a signData signature over the file's contents, checked in signFile's digest form
+                results.append(VerifyResult(index, path, False, 'invalid signature (checked as ed25519-sha256; give algorithm "ed25519" for a signData signature)'))
+            else:
+                results.append(VerifyResult(index, path, False, 'invalid signature'))
+        except Exception as e:
+            results.append(VerifyResult(index, path, False, f'{type(e).__name__}: {e}'))
+    return results
+
+def _merkleLeaf(path: str, digest: bytes) -> bytes:
+    """ Leaf hash binding a file's relative path to its content digest. """
+    return hashlib.sha256(b'\x00' + path.encode() + b'\x00' + digest).digest()
+
+def _merkleLevels(leaves: list) -> list:
+    """ Returns every level of the Merkle tree, leaves first and root last. An odd node is carried up unchanged. """
+    levels = [leaves or [hashlib.sha256(b'').digest()]]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [hashlib.sha256(b'\x01' + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+def _merkleFold(leaf: bytes, proof: list) -> bytes:
+    """ Recomputes the root from a leaf and its [side, sibling hex] proof, where side is 'L' or 'R' for the sibling's position. """
+    node = leaf
+    for side, sibling in proof:
+        sibling = bytes.fromhex(sibling)
+        node = hashlib.sha256(b'\x01' + (sibling + node if side == 'L' else node + sibling)).digest()
+    return node
+
 class DigitalSigning:
-    
+
+    key_check_interval: float = 2.0  # Seconds a cached key is trusted before its file is stat()ed again; 0 checks every load
+    _key_cache = {}  # (absolute path, private) -> (key, file identity, monotonic time of last check)
+
     @staticmethod
-    def generateKeyPair() -> Tuple[rsa.RSAPrivateKey, rsa.RSAPublicKey]:
-        """ Generates and returns a private and public key pair. """
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-            backend=default_backend()
-        )
+    def generateKeyPair(algorithm: str = RSA_PSS) -> Tuple[PrivateKey, PublicKey]:
+        """ Generates and returns a private and public key pair for 'rsa-pss' (RSA-2048), 'ed25519' or 'ecdsa-p256'. """
+        if algorithm == ED25519_SHA256:
+            algorithm = ED25519  # Same key; the name only says how file signatures are made
+        if algorithm == RSA_PSS:
+            private_key = rsa.generate_private_key(
+                public_exponent=65537,
+                key_size=2048,
+                backend=default_backend()
+            )
+        elif algorithm == ED25519:
+            private_key = ed25519.Ed25519PrivateKey.generate()
+        elif algorithm == ECDSA_P256:
+            private_key = ec.generate_private_key(ec.SECP256R1())
+        else:
+            raise ValueError(f'Unsupported algorithm: {algorithm} (expected one of {", ".join(KEY_ALGORITHMS)})')
         public_key = private_key.public_key()
         return private_key, public_key
 
     @staticmethod
-    def saveKeyToFile(key: rsa.RSAPrivateKey, path: str, private: bool=False) -> None:
-        """ Saves a private or public key to a file. """
+    def saveKeyToFile(key: PrivateKey | PublicKey, path: str, private: bool=False) -> None:
+        """ Saves a private or public key to a file. PKCS8/SubjectPublicKeyInfo PEM records the key type for every algorithm. """
         if private:
             pem = key.private_bytes(
                 encoding=serialization.Encoding.PEM,
@@ -34,60 +236,349 @@ class DigitalSigning:
             f.write(pem)
 
     @staticmethod
-    def loadKeyFromFile(path, private: bool=False) -> Tuple[rsa.RSAPrivateKey, rsa.RSAPublicKey]:
-        """ Loads a private or public key from a file. """
+    def loadKeyFromFile(path, private: bool=False, cache: bool=True, algorithm: str = None) -> PrivateKey | PublicKey:
+        """
+        Loads a private or public key from a file; the algorithm is detected from the PEM, and checked when `algorithm` is given.
+        Parsed keys are cached by path. A cached key is returned without touching the disk for
+        key_check_interval seconds, then re-parsed only if the file's inode, size or mtime changed.
+        """
+        key = DigitalSigning._loadKey(path, private, cache)
+        if algorithm is not None and not _keyMatches(key, algorithm):
+            raise ValueError(f'{path}: key algorithm is {_keyAlgorithm(key)}, expected {algorithm}')
+        return key
+
+    @staticmethod
+    def _loadKey(path, private: bool, cache: bool) -> PrivateKey | PublicKey:
+        if not cache:
+            with open(path, 'rb') as f:
+                return DigitalSigning._parseKey(f.read(), private)
+
+        cache_key = (os.path.abspath(path), private)
+        entry = DigitalSigning._key_cache.get(cache_key)
+        now = time.monotonic()
+        if entry is not None:
+            key, identity, checked_at = entry
+            if now - checked_at < DigitalSigning.key_check_interval:
+                return key
+            if DigitalSigning._fileIdentity(cache_key[0]) == identity:
+                DigitalSigning._key_cache[cache_key] = (key, identity, now)
+                return key
+        return DigitalSigning.reloadKey(path, private)
+
+    @staticmethod
+    def reloadKey(path, private: bool=False) -> PrivateKey | PublicKey:
+        """ Re-reads and re-parses a key file, replacing its cached entry (e.g. right after a key rotation). """
+        path = os.path.abspath(path)
+        identity = DigitalSigning._fileIdentity(path)  # Taken before reading, so a write racing the read is seen as a change next time
         with open(path, 'rb') as f:
-            key_bytes = f.read()
-        
+            key = DigitalSigning._parseKey(f.read(), private)
+        DigitalSigning._key_cache[(path, private)] = (key, identity, time.monotonic())
+        return key
+
+    @staticmethod
+    def preloadKeys(directory: str, suffixes: Tuple[str, ...] = ('.pem',)) -> list:
+        """ Parses and caches every key file in a directory, detecting private keys from the PEM header; returns the loaded paths. """
+        loaded = []
+        for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+            if not entry.is_file() or not entry.name.endswith(suffixes):
+                continue
+            with open(entry.path, 'rb') as f:
+                private = b'PRIVATE KEY-----' in f.read(64)
+            DigitalSigning.reloadKey(entry.path, private)
+            loaded.append(os.path.abspath(entry.path))
+        return loaded
+
+    @staticmethod
+    def clearKeyCache() -> None:
+        """ Drops all cached keys. """
+        DigitalSigning._key_cache.clear()
+
+    @staticmethod
+    def _parseKey(key_bytes: bytes, private: bool) -> PrivateKey | PublicKey:
         if private:
             return serialization.load_pem_private_key(key_bytes, password=None, backend=default_backend())
         else:
             return serialization.load_pem_public_key(key_bytes, backend=default_backend())
 
     @staticmethod
-    def signData(data, private_key: rsa.RSAPrivateKey) -> bytes:
-        """ Signs the data using the provided private key. """
-        signature = private_key.sign(
-            data,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
-        return signature
+    def _fileIdentity(path: str) -> tuple:
+        stat = os.stat(path)
+        return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def signData(data, private_key: PrivateKey) -> bytes:
+        """
+        Signs the data using the provided private key, with the key's algorithm. RSA-PSS and ECDSA sign its SHA-256
+        digest; Ed25519 signs the data itself, so the signature verifies with any standard Ed25519 implementation.
+        """
+        return _signMessage(private_key, data)
+
+    @staticmethod
+    def hashFile(path: str, chunk_size: int = CHUNK_SIZE) -> bytes:
+        """ Returns the SHA-256 digest of a file, read in fixed-size chunks into one reused buffer. """
+        digest = hashlib.sha256()
+        with open(path, 'rb', buffering=0) as f:
+            buffer = bytearray(min(chunk_size, os.fstat(f.fileno()).st_size + 1))  # Small files need no 1 MiB buffer
+            view = memoryview(buffer)
+            while True:
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                digest.update(view[:size])
+        return digest.digest()
+
+    @staticmethod
+    def signFile(path: str, private_key: PrivateKey, chunk_size: int = CHUNK_SIZE) -> bytes:
+        """
+        Signs a file of any size in constant memory by signing its prehashed SHA-256 digest.
+        For RSA-PSS and ECDSA the signature is identical in form to signData(file_contents). Ed25519 cannot sign a
+        stream, so it signs the digest instead: a non-standard 'ed25519-sha256' signature that only verifyFile,
+        verifyDigest or verifySignature(..., algorithm='ed25519-sha256') accept. Tag it when saving.
+        """
+        return _signDigest(private_key, DigitalSigning.hashFile(path, chunk_size))
 
     @staticmethod
-    def saveSignatureToFile(signature: bytes, path: str) -> None:
-        """ Saves the signature to a file. """
+    def verifyFile(path: str, signature: bytes | str, public_key: PublicKey, chunk_size: int = CHUNK_SIZE, algorithm: str = None) -> bool:
+        """
+        Verifies a file's signature from signFile in constant memory; returns False for a bad signature and raises on
+        I/O errors. `signature` may be the path of a signature file, whose tag then selects the algorithm; an 'ed25519'
+        signature (signData over the contents) is checked too, reading the whole file.
+        """
+        try:
+            signature, algorithm = _resolveSignature(signature, algorithm)
+            _verifyFileSignature(public_key, signature, path, algorithm, chunk_size)
+            return True
+        except (InvalidSignature, ValueError):
+            return False
+
+    @staticmethod
+    def verifyDigest(digest: bytes, signature: bytes, public_key: PublicKey, algorithm: str = None) -> bool:
+        """ Verifies a signFile-style signature against a SHA-256 digest computed elsewhere (e.g. while the data was downloaded). """
+        if algorithm is not None and algorithm != _digestAlgorithm(public_key):
+            return False
+        try:
+            _verifyDigest(public_key, signature, digest)
+            return True
+        except InvalidSignature:
+            return False
+
+    @staticmethod
+    def saveSignatureToFile(signature: bytes, path: str, algorithm: str = None) -> None:
+        """ Saves the signature to a file, tagged with its algorithm when one is given (untagged files read back as RSA-PSS). """
+        if algorithm is not None:
+            if algorithm not in ALGORITHMS:
+                raise ValueError(f'Unsupported algorithm: {algorithm}')
+            signature = SIGNATURE_MAGIC + algorithm.encode() + b':' + signature
         with open(path, 'wb') as f:
             f.write(signature)
     
     @staticmethod
-    def loadSignatureFromFile(path: str) -> bytes:
-        """ Loads the signature from a file. """
-        with open(path, 'rb') as f:
-            signature = f.read()
-        return signature
+    def loadSignatureFromFile(path: str, with_algorithm: bool = False) -> bytes | Tuple[str, bytes]:
+        """ Loads the signature from a file, or (algorithm, signature) with `with_algorithm`. """
+        algorithm, signature = _readSignature(path)
+        return (algorithm or RSA_PSS, signature) if with_algorithm else signature
 
     @staticmethod
-    def verifySignature(data: bytes, signature: bytes, public_key: rsa.RSAPublicKey) -> bool:
-        """ Verifies the provided signature using the public key. """
+    def verifySignature(data: bytes, signature: bytes | str, public_key: PublicKey, algorithm: str = None) -> bool:
+        """ Verifies the provided signature using the public key, whose type selects the algorithm unless the signature file's tag or `algorithm` names it. """
         try:
-            public_key.verify(
-                signature,
-                data,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            signature, algorithm = _resolveSignature(signature, algorithm)
+            _checkAlgorithm(public_key, algorithm)
+            _verifyMessage(public_key, signature, data, algorithm)
             return True
         except Exception as e:
             print(f'Verification failed: {e}')
             return False
 
+    @staticmethod
+    def verifyMany(items: Iterable[tuple], public_key: PublicKey, workers: int = None, batch_size: int = None, progress: Callable[[int, int], None] = None) -> list:
+        """
+        Verifies many (file path or data bytes, signature[, algorithm]) items across a process pool and returns
+        one VerifyResult per item, in input order. Paths are checked as by verifyFile and data as by
+        verifySignature, so a signature may also be a tagged signature file's path. Nothing is printed. Each worker
+        parses the public key once, and items are sent in batches to amortize inter-process overhead.
+        `progress(done, total)` is called in the calling process as batches complete. workers=1 verifies in-process.
+        """
+        items = [(index, source, signature, rest[0] if rest else None) for index, (source, signature, *rest) in enumerate(items)]
+        total = len(items)
+        workers = workers or os.cpu_count() or 1
+        if not batch_size:
+            batch_size = max(1, min(256, total // (workers * 4)))
+        batches = [items[start:start + batch_size] for start in range(0, total, batch_size)]
+        results = [None] * total
+        done = 0
+
+        if workers == 1 or len(batches) <= 1:
+            for batch in batches:
+                for result in _verifyBatch(batch, public_key):
+                    results[result.index] = result
+                done += len(batch)
+                if progress:
+                    progress(done, total)
+            return results
+
+        public_pem = public_key.public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches)), initializer=_initVerifier, initargs=(public_pem,)) as executor:
+            pending = {executor.submit(_verifyBatch, batch) for batch in batches}
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    batch_results = future.result()
+                    for result in batch_results:
+                        results[result.index] = result
+                    done += len(batch_results)
+                if progress:
+                    progress(done, total)
+        return results
+
+    @staticmethod
+    def benchmark(algorithms: Iterable[str] = KEY_ALGORITHMS, data_size: int = 1024, seconds: float = 1.0) -> dict:
+        """
+        Measures key generation, signing and verification throughput (operations per second) and signature
+        size for each algorithm, spending about `seconds` on each measurement.
+        """
+        data = os.urandom(data_size)
+        results = {}
+        for algorithm in algorithms:
+            private_key, public_key = DigitalSigning.generateKeyPair(algorithm)
+            signature = DigitalSigning.signData(data, private_key)
+            results[algorithm] = {
+                'keygen_per_sec': _rate(lambda: DigitalSigning.generateKeyPair(algorithm), seconds),
+                'sign_per_sec': _rate(lambda: DigitalSigning.signData(data, private_key), seconds),
+                'verify_per_sec': _rate(lambda: DigitalSigning.verifySignature(data, signature, public_key), seconds),
+                'signature_bytes': len(signature),
+            }
+        return results
+
+    @staticmethod
+    def signManifest(directory: str, private_key: PrivateKey, manifest_path: str = None, previous: dict = None, workers: int = None) -> dict:
+        """
+        Hashes every file under a directory into a Merkle tree and signs only its root (one signing operation).
+        Per-file digests from the previous manifest (`previous`, or the one already at `manifest_path`) are
+        reused when a file's size and mtime are unchanged, so re-signing after a patch only rehashes changed
+        files. Hashing runs on `workers` threads. The manifest is written to `manifest_path` when given.
+        """
+        if previous is None and manifest_path and os.path.exists(manifest_path):
+            previous = DigitalSigning.loadManifest(manifest_path)
+        cached = {entry['path']: entry for entry in previous['files']} if previous else {}
+
+        files, rehashed = DigitalSigning._hashTree(directory, cached, manifest_path, workers)
+        root = _merkleLevels([_merkleLeaf(entry['path'], bytes.fromhex(entry['digest'])) for entry in files])[-1][0]
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'algorithm': _keyAlgorithm(private_key),
+            'files': files,
+            'root': root.hex(),
+            'signature': base64.b64encode(DigitalSigning.signData(MANIFEST_CONTEXT + root, private_key)).decode(),
+        }
+        if manifest_path:
+            DigitalSigning.saveManifest(manifest, manifest_path)
+        return dict(manifest, rehashed=rehashed)
+
+    @staticmethod
+    def saveManifest(manifest: dict, path: str) -> None:
+        """ Saves a manifest as JSON, replacing any previous file atomically. """
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({key: manifest[key] for key in ('version', 'algorithm', 'files', 'root', 'signature')}, f, indent=1)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def loadManifest(path: str) -> dict:
+        """ Loads a manifest saved by signManifest/saveManifest. """
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f'Unsupported manifest version: {manifest.get("version")}')
+        return manifest
+
+    @staticmethod
+    def verifyManifest(manifest: dict, public_key: PublicKey, directory: str = None, manifest_path: str = None, workers: int = None) -> bool:
+        """
+        Checks that the manifest's entries produce its signed root. With `directory`, also rehashes every file
+        (in parallel, ignoring `manifest_path`) and checks the tree holds exactly the listed files and digests.
+        """
+        leaves = [_merkleLeaf(entry['path'], bytes.fromhex(entry['digest'])) for entry in manifest['files']]
+        if _merkleLevels(leaves)[-1][0].hex() != manifest['root'] or not DigitalSigning._verifyManifestRoot(manifest, public_key):
+            return False
+        if directory is None:
+            return True
+        files, _ = DigitalSigning._hashTree(directory, {}, manifest_path, workers)
+        return [(entry['path'], entry['digest']) for entry in files] == [(entry['path'], entry['digest']) for entry in manifest['files']]
+
+    @staticmethod
+    def manifestProof(manifest: dict, relative_path: str) -> dict:
+        """ Returns a self-contained inclusion proof for one file, so it can be verified without the full manifest. """
+        paths = [entry['path'] for entry in manifest['files']]
+        try:
+            index = paths.index(relative_path)
+        except ValueError:
+            raise KeyError(f'Not in manifest: {relative_path}') from None
+        levels = _merkleLevels([_merkleLeaf(entry['path'], bytes.fromhex(entry['digest'])) for entry in manifest['files']])
+
+        proof = []
+        for level in levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):  # A lone last node is carried up without a sibling
+                proof.append(['L' if sibling < index else 'R', level[sibling].hex()])
+            index //= 2
+        return {'path': relative_path, 'proof': proof, 'root': manifest['root'], 'algorithm': manifest.get('algorithm', RSA_PSS), 'signature': manifest['signature']}
+
+    @staticmethod
+    def verifyManifestFile(directory: str, relative_path: str, manifest_or_proof: dict, public_key: PublicKey) -> bool:
+        """
+        Verifies one file against a signed manifest by hashing only that file and folding its inclusion proof
+        up to the signed root. Accepts a full manifest or a proof from manifestProof.
+        """
+        proof = manifest_or_proof if 'proof' in manifest_or_proof else DigitalSigning.manifestProof(manifest_or_proof, relative_path)
+        if proof['path'] != relative_path:
+            return False
+        digest = DigitalSigning.hashFile(os.path.join(directory, *relative_path.split('/')))
+        if _merkleFold(_merkleLeaf(relative_path, digest), proof['proof']).hex() != proof['root']:
+            return False
+        return DigitalSigning._verifyManifestRoot(proof, public_key)
+
+    @staticmethod
+    def _hashTree(directory: str, cached: dict, exclude: str = None, workers: int = None) -> Tuple[list, int]:
+        """ Returns (sorted file entries, number of files hashed), reusing cached digests for unchanged files. """
+        directory = os.path.abspath(directory)
+        exclude = os.path.abspath(exclude) if exclude else None
+        files, to_hash = [], []
+        for root, dirs, names in os.walk(directory):
+            for name in names:
+                full_path = os.path.join(root, name)
+                if full_path == exclude:
+                    continue
+                stat = os.stat(full_path)
+                entry = {'path': os.path.relpath(full_path, directory).replace(os.sep, '/'), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': None}
+                old = cached.get(entry['path'])
+                if old and old['size'] == entry['size'] and old['mtime_ns'] == entry['mtime_ns']:
+                    entry['digest'] = old['digest']
+                else:
+                    to_hash.append((entry, full_path))
+                files.append(entry)
+        files.sort(key=lambda entry: entry['path'])
+
+        if to_hash:
+            with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4)) as executor:  # hashlib and file reads release the GIL
+                for (entry, _), digest in zip(to_hash, executor.map(DigitalSigning.hashFile, [full_path for _, full_path in to_hash])):
+                    entry['digest'] = digest.hex()
+        return files, len(to_hash)
+
+    @staticmethod
+    def _verifyManifestRoot(signed: dict, public_key: PublicKey) -> bool:
+        """ Checks the root signature of a manifest or proof (manifests without an algorithm are RSA-PSS). """
+        if signed.get('algorithm', RSA_PSS) != _keyAlgorithm(public_key):
+            return False
+        try:
+            _verifyMessage(public_key, base64.b64decode(signed['signature']), MANIFEST_CONTEXT + bytes.fromhex(signed['root']))
+            return True
+        except InvalidSignature:
+            return False
+
 # Example usage
 if __name__ == '__main__':
     import os
@@ -104,13 +595,8 @@ if __name__ == '__main__':
         DigitalSigning.saveKeyToFile(private_key, os.path.join(os.getcwd(), 'Tests', 'DigitslSigning', 'client_exe_pvt_key.pem'), private=True)
         DigitalSigning.saveKeyToFile(public_key, os.path.join(os.getcwd(), 'Tests', 'DigitslSigning', 'client_exe_pub_key.pem'))
 
-        # Get the data to sign (e.g., an executable):
-        with open(os.path.join(os.getcwd(), 'Tests', 'DigitslSigning', 'fake_exe.txt'), 'rb') as f:
-            data = f.read()
-            print(f'Data to sign: {data}')
-
-        # Sign the data (e.g., an executable):
-        signature = DigitalSigning.signData(data, private_key)
+        # Sign the file to distribute (e.g., an executable), streaming it instead of reading it into memory:
+        signature = DigitalSigning.signFile(os.path.join(os.getcwd(), 'Tests', 'DigitslSigning', 'fake_exe.txt'), private_key)
 
         # Save the signature to a file:
         DigitalSigning.saveSignatureToFile(signature, os.path.join(os.getcwd(), 'Tests', 'DigitslSigning', 'client_exe_signature.bin'))
@@ -124,13 +610,14 @@ if __name__ == '__main__':
         public_key = DigitalSigning.loadKeyFromFile(os.path.join(os.getcwd(), 'Tests', 'DigitslSigning', 'client_exe_pub_key.pem'))
         signature = DigitalSigning.loadSignatureFromFile(os.path.join(os.getcwd(), 'Tests', 'DigitslSigning', 'client_exe_signature.bin'))
 
-        # Get the data to verify:
-        with open(os.path.join(os.getcwd(), 'Tests', 'DigitslSigning', 'fake_exe.txt'), 'rb') as f:
-            data = f.read()
-
-        # Verify the signature:
-        is_valid = DigitalSigning.verifySignature(data, signature, public_key)
+        # Verify the signature of the file:
+        is_valid = DigitalSigning.verifyFile(os.path.join(os.getcwd(), 'Tests', 'DigitslSigning', 'fake_exe.txt'), signature, public_key)
         if is_valid:
             print('Signature is valid!')
         else:
-            print('Signature is invalid!')
\ No newline at end of file
+            print('Signature is invalid!')
+
+    elif ENV == 'BENCHMARK':
+        # Compare the supported algorithms:
+        for algorithm, result in DigitalSigning.benchmark(seconds=0.5).items():
+            print(f"{algorithm:>11}: keygen {result['keygen_per_sec']:>9.1f}/s  sign {result['sign_per_sec']:>9.1f}/s  verify {result['verify_per_sec']:>9.1f}/s  signature {result['signature_bytes']} bytes")
\ No newline at end of file
@@ -1,20 +1,427 @@
-from cryptography.fernet import Fernet
+from email import message_from_bytes, policy
+from email.header import Header
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.utils import formataddr, formatdate, getaddresses, make_msgid, parseaddr
+from html import escape
 import logging
 import os
+import queue
 import smtplib
-from smtplib import SMTPException
+from smtplib import SMTPConnectError, SMTPException, SMTPRecipientsRefused, SMTPResponseException, SMTPServerDisconnected
+from string import Template
+import threading
+import time
+from typing import Callable, Iterable
+import uuid
+
+from .secret_cache import SecretCache
 
 logger = logging.getLogger(__name__)
+MAX_LINE_LENGTH = 998  # SMTP line limit in octets, not counting the CRLF
+
+class SMTPSession:
+    """An authenticated SMTP connection plus its usage counters."""
+
+    def __init__(self, connect: Callable[[], smtplib.SMTP]) -> None:
+        self.connect = connect
+        self.server = connect()
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+    def reconnect(self) -> None:
+        self.close()
+        self.server = self.connect()
+        self.sent = 0
+
+    def isAlive(self) -> bool:
+        try:
+            return self.server.noop()[0] == 250
+        except (SMTPException, OSError):
+            return False
+
+    def close(self) -> None:
+        try:
+            self.server.quit()
+        except (SMTPException, OSError):
+            self.server.close()
+
+class SMTPSessionPool:
+    """
+    Thread-safe pool of authenticated SMTP sessions.
+
+    Sessions are checked with NOOP before reuse and replaced when they fail it, have been idle
+    for more than `idle_timeout` seconds, or have sent `max_messages` messages.
+    """
+
+    def __init__(self, connect: Callable[[], smtplib.SMTP], pool_size: int = 1, max_messages: int = 100, idle_timeout: float = 60.0, wait_timeout: float = 30.0) -> None:
+        if pool_size < 1:
+            raise ValueError(f'Invalid pool size: {pool_size}')
+        self.connect = connect
+        self.pool_size = pool_size
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self.wait_timeout = wait_timeout
+
+        self._idle = []
+        self._size = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def acquire(self) -> SMTPSession:
+        deadline = time.monotonic() + self.wait_timeout
+        with self._cond:
+            while not self._idle and self._size >= self.pool_size:
+                if self._closed:
+                    raise RuntimeError('SMTPSessionPool.acquire.error: pool is closed')
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f'SMTPSessionPool.acquire.error: no session available after {self.wait_timeout}s')
+                self._cond.wait(remaining)
+            if self._closed:
+                raise RuntimeError('SMTPSessionPool.acquire.error: pool is closed')
+            session = self._idle.pop() if self._idle else None
+            if session is None:
+                self._size += 1
+
+        try:
+            if session is None:
+                return SMTPSession(self.connect)
+            if time.monotonic() - session.last_used > self.idle_timeout or not session.isAlive():
+                session.reconnect()
+            return session
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, session: SMTPSession, discard: bool = False) -> None:
+        session.last_used = time.monotonic()
+        recycle = discard or self._closed or session.sent >= self.max_messages
+        with self._cond:
+            if recycle:
+                self._size -= 1
+            else:
+                self._idle.append(session)
+            self._cond.notify()
+        if recycle:
+            session.close()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for session in idle:
+            session.close()
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` operations per second with bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = None) -> None:
+        if rate <= 0:
+            raise ValueError(f'Invalid rate: {rate}')
+        self.rate = rate
+        self.burst = burst if burst else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, stop: threading.Event = None) -> bool:
+        """Block until a token is available; returns False if `stop` is set first."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if stop is not None:
+                if stop.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+class EmailQueue:
+    """
+    Bounded background queue that delivers emails on a pool of worker threads.
+
+    `put` blocks when `max_queue` jobs are waiting (backpressure). Sends are paced by an
+    optional token bucket. Transient failures (disconnects, timeouts, 4xx replies) are retried
+    with exponential backoff up to `max_retries` times. Permanent failures and exhausted
+    retries go to `dead_letters`.
+    """
+
+    def __init__(self, deliver: Callable[[tuple], None], workers: int = 4, max_queue: int = 10000, rate: float = None, burst: int = None, max_retries: int = 3, backoff: float = 1.0, max_backoff: float = 60.0) -> None:
+        self.deliver = deliver
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.dead_letters = []  # (job, error message)
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._cond = threading.Condition()
+        self._pending = 0  # Queued plus in-flight jobs
+        self._in_flight = 0
+        self._counters = {'enqueued': 0, 'sent': 0, 'retries': 0, 'failed': 0}
+        self._started = time.monotonic()
+        self._workers = [threading.Thread(target=self._work, name=f'EmailQueue-{index}', daemon=True) for index in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def put(self, job: tuple, timeout: float = None) -> None:
+        """Queue a job, waiting up to `timeout` seconds for room (raises queue.Full)."""
+        if self._stop.is_set():
+            raise RuntimeError('EmailQueue.put.error: queue is shut down')
+        with self._cond:
+            self._pending += 1
+            self._counters['enqueued'] += 1
+        try:
+            self._queue.put(job, timeout=timeout)
+        except queue.Full:
+            with self._cond:
+                self._pending -= 1
+                self._counters['enqueued'] -= 1
+                self._cond.notify_all()
+            raise
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until every queued job has been sent or dead-lettered; returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+    def shutdown(self, wait: bool = True, timeout: float = None) -> None:
+        """Stop the workers, after draining the queue when `wait` is set. Unsent jobs are dead-lettered."""
+        if wait:
+            self.flush(timeout)
+        self._stop.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._finish(job, 'failed', 'queue shut down before delivery')
+
+    @property
+    def closed(self) -> bool:
+        return self._stop.is_set()
+
+    def stats(self) -> dict:
+        with self._cond:
+            elapsed = time.monotonic() - self._started
+            return dict(
+                self._counters,
+                queue_depth=self._queue.qsize(),
+                in_flight=self._in_flight,
+                dead_letters=len(self.dead_letters),
+                throughput=self._counters['sent'] / elapsed if elapsed else 0.0,
+            )
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self._queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            with self._cond:
+                self._in_flight += 1
+            try:
+                self._attempt(job)
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+
+    def _attempt(self, job: tuple) -> None:
+        for attempt in range(self.max_retries + 1):
+            if self.bucket and not self.bucket.acquire(self._stop):
+                self._finish(job, 'failed', 'queue shut down before delivery')
+                return
+            try:
+                self.deliver(job)
+                self._finish(job, 'sent')
+                return
+            except Exception as e:
+                if not self.isTransient(e) or attempt == self.max_retries:
+                    logger.error(f'Failed to send email to {job[0]}: {e}')
+                    self._finish(job, 'failed', str(e))
+                    return
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                logger.info(f'Transient error sending to {job[0]} ({e}); retrying in {delay:.1f}s.')
+                with self._cond:
+                    self._counters['retries'] += 1
+                if self._stop.wait(delay):
+                    self._finish(job, 'failed', f'queue shut down while retrying: {e}')
+                    return
+
+    def _finish(self, job: tuple, outcome: str, error: str = None) -> None:
+        with self._cond:
+            self._counters[outcome] += 1
+            if error is not None:
+                self.dead_letters.append((job, error))
+            self._pending -= 1
+            self._cond.notify_all()
+
+    @staticmethod
+    def isTransient(error: Exception) -> bool:
+        """Disconnects, timeouts, socket errors and 4xx SMTP replies are worth retrying."""
+        if isinstance(error, (SMTPServerDisconnected, SMTPConnectError, TimeoutError, ConnectionError)):
+            return True
+        if isinstance(error, SMTPRecipientsRefused):
+            return all(400 <= code < 500 for code, _ in error.recipients.values())
+        if isinstance(error, SMTPResponseException):
+            return 400 <= error.smtp_code < 500
+        if isinstance(error, SMTPException):
+            return False  # e.g. SMTPNotSupportedError; SMTPException subclasses OSError, so check it first
+        return isinstance(error, OSError)
+
+def _crlf(text: str) -> str:
+    return text.replace('\r\n', '\n').replace('\r', '\n').replace('\n', '\r\n')
+
+def _textValue(value) -> bytes:
+    return _crlf(str(value)).encode()
+
+def _htmlValue(value) -> bytes:
+    return _crlf(escape(str(value))).encode()
+
+def _headerValue(value) -> bytes:
+    return ' '.join(str(value).splitlines()).encode()  # No line breaks: they would inject headers
+
+def _addressHeader(value) -> str:
+    """Format one or more addresses for a From/To header, RFC 2047-encoding non-ASCII display names."""
+    values = [value] if isinstance(value, str) else list(value)
+    flat = (' '.join(str(item).splitlines()) for item in values)  # No line breaks: they would inject headers
+    return ', '.join(formataddr(pair, charset='utf-8') for pair in getaddresses(flat))
+
+def _reencodeText(message: bytes, cte: str) -> bytes:
+    """Re-encode the text parts of an 8bit message as base64 or quoted-printable, which keep every line short and ASCII."""
+    parsed = message_from_bytes(message, policy=policy.SMTP)
+    for part in parsed.walk():
+        if part.get_content_maintype() == 'text':
+            part.set_content(part.get_content(), subtype=part.get_content_subtype(), cte=cte)
+    return parsed.as_bytes()
+
+def _hasLongLine(message: bytes) -> bool:
+    """Whether a line exceeds SMTP's line limit (RFC 5321 4.5.3.1.6)."""
+    return len(message) > MAX_LINE_LENGTH and any(len(line) > MAX_LINE_LENGTH for line in message.split(b'\r\n'))
+
+class MailMergeTemplate:
+    """
+    Subject and body template compiled once into a pre-encoded MIME skeleton.
+
+    Fields use `string.Template` syntax (`$name` or `${name}`, `$$` for a dollar sign). The
+    literal text, MIME headers and boundaries are encoded to UTF-8 bytes at compile time, so
+    rendering a message only joins constant byte strings with the recipient's encoded values.
+    Values are HTML-escaped in the HTML part and flattened to one line in the subject.
+
+    Parts are sent as 8bit UTF-8. When a message is not pure ASCII and the server does not
+    advertise 8BITMIME, it is re-encoded as base64 before sending. A message with a line over
+    SMTP's 998-octet limit, e.g. single-line newsletter HTML, is sent quoted-printable instead.
+    """
+
+    def __init__(self, subject: str, text: str, html: str = None, sender: str = None, recipient_field: str = 'email') -> None:
+        self.sender = sender
+        self.recipient_field = recipient_field
+        self._subject = self._merge(self._compile(subject, _headerValue))
+
+        part_headers = 'Content-Type: text/{}; charset="utf-8"\r\nContent-Transfer-Encoding: 8bit\r\n\r\n'
+        if html is None:
+            body = ['MIME-Version: 1.0\r\n' + part_headers.format('plain'), *self._compile(text, _textValue)]
+        else:
+            boundary = f'=_merge_{uuid.uuid4().hex}'
+            body = [
+                f'MIME-Version: 1.0\r\nContent-Type: multipart/alternative; boundary="{boundary}"\r\n\r\n',
+                f'--{boundary}\r\n' + part_headers.format('plain'), *self._compile(text, _textValue),
+                f'\r\n--{boundary}\r\n' + part_headers.format('html'), *self._compile(html, _htmlValue),
+                f'\r\n--{boundary}--\r\n',
+            ]
+        self._body = self._merge(body)
+        self._senders = {}  # from_address -> (From header, Message-ID domain)
+
+    def render(self, fields: dict, from_address: str) -> tuple:
+        """
+        Return (from_address, recipient, message_bytes) for one recipient.
+
+        Example Usage:
+        template = MailMergeTemplate('Hi $name', 'Hello $name, your code is $code.')
+        from_address, recipient, message = template.render({'email': 'a@example.com', 'name': 'Ann', 'code': 42}, 'news@example.com')
+        """
+        try:
+            recipient = fields[self.recipient_field]
+            subject = self._fill(self._subject, fields).decode()
+            body = self._fill(self._body, fields)
+        except KeyError as e:
+            raise KeyError(f'MailMergeTemplate.render.error: missing field {e}') from None
+
+        sender = self._senders.get(from_address)
+        if sender is None:
+            sender = self._senders[from_address] = (_addressHeader(from_address), parseaddr(from_address)[1].rpartition('@')[2] or 'localhost')
+        from_header, domain = sender
+        if not subject.isascii():
+            subject = Header(subject, 'utf-8').encode(linesep='\r\n')  # Folded lines must end in CRLF like the rest of the message
+        to = _addressHeader(recipient)
+
+        headers = f'From: {from_header}\r\nTo: {to}\r\nSubject: {subject}\r\nDate: {formatdate(localtime=True)}\r\nMessage-ID: {make_msgid(domain=domain)}\r\n'
+        return from_address, recipient, headers.encode() + body
+
+    @staticmethod
+    def _fill(segments: list, fields: dict) -> bytes:
+        return b''.join(segment if isinstance(segment, bytes) else segment[1](fields[segment[0]]) for segment in segments)
+
+    @staticmethod
+    def _compile(template: str, convert: Callable) -> list:
+        """Split a template into literal text and (field name, converter) slots."""
+        segments, position = [], 0
+        for match in Template.pattern.finditer(template):
+            segments.append(_crlf(template[position:match.start()]))
+            position = match.end()
+            if match.group('escaped') is not None:
+                segments.append('$')
+                continue
+            name = match.group('named') or match.group('braced')
+            if name is None:
+                raise ValueError(f'MailMergeTemplate.error: invalid placeholder at position {match.start("invalid")}')
+            segments.append((name, convert))
+        segments.append(_crlf(template[position:]))
+        return segments
+
+    @staticmethod
+    def _merge(segments: list) -> list:
+        """Encode literal text and join adjacent literals into single byte strings."""
+        merged, literal = [], []
+        for segment in segments:
+            if isinstance(segment, str):
+                literal.append(segment)
+                continue
+            if literal:
+                merged.append(''.join(literal).encode())
+                literal = []
+            merged.append(segment)
+        if literal:
+            merged.append(''.join(literal).encode())
+        return [segment for segment in merged if segment != b'']
 
-class Emailer:
+class EmailerBase:
+    """
+    Credentials and message building shared by Emailer and AsyncEmailer.
+
+    Each subclass declares its own `secrets` cache, so the two senders keep separate credentials.
+    """
 
     symmetric_key: bytes
     login_email: bytes
     login_password: bytes
     smtp_server: bytes
     smtp_port: bytes
+    secrets: SecretCache
+    starttls: bool = True  # Set False only for a plain local SMTP server, e.g. a test stand-in
 
     @classmethod
     def setCredentials(cls, symmetric_key: bytes, login_email: bytes, login_password: bytes, smtp_server: bytes, smtp_port: bytes):
@@ -23,47 +430,247 @@ class Emailer:
         cls.login_password = login_password
         cls.smtp_server = smtp_server
         cls.smtp_port = smtp_port
+        cls.secrets.rotate(symmetric_key, login_email=login_email, login_password=login_password, smtp_server=smtp_server, smtp_port=smtp_port)
 
     @classmethod
     def accessCredentials(cls) -> tuple:
-        cipher = Fernet(cls.symmetric_key)
+        """Return the decrypted credentials; they are decrypted once and then served from `cls.secrets`."""
         try:
-            login_email = cipher.decrypt(cls.login_email).decode()
-            login_password = cipher.decrypt(cls.login_password).decode()
-            smtp_server = cipher.decrypt(cls.smtp_server).decode()
-            smtp_port = cipher.decrypt(cls.smtp_port).decode()
+            login_email, login_password, smtp_server, smtp_port = cls.secrets.get('login_email', 'login_password', 'smtp_server', 'smtp_port')
         except Exception as e:
             raise ValueError(f'Failed to decrypt credentials: {e}')
 
         return login_email, login_password, smtp_server, smtp_port
 
     @classmethod
-    def sendEmail(cls, recipient, subject, body, sender=None):
-        try:
-            # Get decrypted credentials
-            login_email, login_password, smtp_server, smtp_port = cls.accessCredentials()
+    def _buildMessage(cls, recipient, subject, body, sender=None) -> tuple:
+        """Return (from_address, recipient, message_string)."""
+        login_email = cls.accessCredentials()[0]
 
-            message = MIMEMultipart()
-            message['Subject'] = subject
-            message['From'] = sender if sender else login_email
-            message['To'] = recipient
+        message = MIMEMultipart()
+        message['Subject'] = subject
+        message['From'] = sender if sender else login_email
+        message['To'] = recipient
 
-            # Add body to the email
-            message.attach(MIMEText(body, 'plain'))
+        # Add body to the email
+        message.attach(MIMEText(body, 'plain'))
 
-            # Connect to the SMTP server
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()  # Secure the connection
-            server.login(login_email, login_password)
+        return sender if sender else login_email, recipient, message.as_string()
+
+    @staticmethod
+    def _mailOptions(message: str | bytes, supports_8bitmime: bool) -> tuple:
+        """
+        Return (message, mail_options): quoted-printable when a line is too long for SMTP, else BODY=8BITMIME for
+        non-ASCII bytes, or the message re-encoded as base64 if the server lacks it.
+        """
+        if isinstance(message, bytes) and _hasLongLine(message):
+            return _reencodeText(message, 'quoted-printable'), ()
+        if isinstance(message, bytes) and not message.isascii():
+            if supports_8bitmime:
+                return message, ('BODY=8BITMIME',)
+            return _reencodeText(message, 'base64'), ()
+        return message, ()
+
+class Emailer(EmailerBase):
+
+    secrets = SecretCache()  # Call Emailer.secrets.clear() to drop the decrypted credentials
+    _sessions: SMTPSessionPool = None
+    _queue: EmailQueue = None
+
+    @classmethod
+    def configureSession(cls, pool_size: int = 1, max_messages: int = 100, idle_timeout: float = 60.0, wait_timeout: float = 30.0) -> None:
+        """
+        Reuse authenticated SMTP connections across sendEmail calls, replacing any existing pool.
+
+        Up to `pool_size` sessions are kept alive. A session is checked with NOOP before reuse,
+        recycled after `max_messages` messages or `idle_timeout` idle seconds, and transparently
+        reconnected if the server dropped it.
+
+        Example Usage:
+        Emailer.configureSession(pool_size=2, max_messages=200)
+        """
+        pool = SMTPSessionPool(cls._connect, pool_size=pool_size, max_messages=max_messages, idle_timeout=idle_timeout, wait_timeout=wait_timeout)
+        old_pool, cls._sessions = cls._sessions, pool
+        if old_pool:
+            old_pool.close()
+
+    @classmethod
+    def closeSessions(cls) -> None:
+        """Quit all pooled sessions and go back to one connection per email."""
+        old_pool, cls._sessions = cls._sessions, None
+        if old_pool:
+            old_pool.close()
+
+    @classmethod
+    def startQueue(cls, workers: int = 4, max_queue: int = 10000, rate: float = None, burst: int = None, max_retries: int = 3, backoff: float = 1.0) -> None:
+        """
+        Start the background send queue used by `enqueue`.
+
+        `rate` caps sends per second across all workers (None for unlimited). Combine with
+        `configureSession(pool_size=workers)` so each worker reuses its own SMTP connection.
+
+        Example Usage:
+        Emailer.configureSession(pool_size=4)
+        Emailer.startQueue(workers=4, rate=10, burst=20)
+        """
+        if cls._queue is not None and not cls._queue.closed:
+            raise RuntimeError('Emailer.startQueue.error: queue already running; call Emailer.shutdown() first')
+        cls._queue = EmailQueue(cls._deliverJob, workers=workers, max_queue=max_queue, rate=rate, burst=burst, max_retries=max_retries, backoff=backoff)
+
+    @classmethod
+    def enqueue(cls, recipient, subject, body, sender=None, timeout: float = None) -> None:
+        """
+        Queue an email for background delivery, starting a default queue if none is running.
+
+        Blocks for up to `timeout` seconds (forever when None) while the queue is full, then raises queue.Full.
+
+        Example Usage:
+        for user in users:
+            Emailer.enqueue(user.email, 'Maintenance tonight', body)
+        Emailer.flush()
+        """
+        if cls._queue is None or cls._queue.closed:
+            cls.startQueue()
+        cls._queue.put((recipient, subject, body, sender), timeout=timeout)
+
+    @classmethod
+    def flush(cls, timeout: float = None) -> bool:
+        """Wait until every queued email is sent or dead-lettered; returns False on timeout."""
+        return cls._queue.flush(timeout) if cls._queue else True
+
+    @classmethod
+    def shutdown(cls, wait: bool = True, timeout: float = None) -> None:
+        """Stop the queue (draining it first when `wait` is set) and close pooled sessions."""
+        if cls._queue is not None:
+            cls._queue.shutdown(wait=wait, timeout=timeout)
+        cls.closeSessions()
+
+    @classmethod
+    def queueStats(cls) -> dict:
+        """Return queue depth, in-flight, sent/retried/failed counters and throughput (sent/sec)."""
+        return cls._queue.stats() if cls._queue else {}
 
-            server.sendmail(sender if sender else login_email, recipient, message.as_string())
-            server.quit()
+    @classmethod
+    def deadLetters(cls) -> list:
+        """
+        Return the jobs that could not be delivered, with their errors. Jobs are (recipient, subject, body, sender)
+        tuples from `enqueue`, or (recipient, template, fields) tuples from `sendMerge(..., background=True)`.
+        """
+        return list(cls._queue.dead_letters) if cls._queue else []
+
+    @classmethod
+    def _deliverJob(cls, job: tuple) -> None:
+        if isinstance(job[1], MailMergeTemplate):
+            _, template, fields = job
+            cls._deliver(*template.render(fields, template.sender or cls.accessCredentials()[0]))
+        else:
+            cls._deliver(*cls._buildMessage(*job))
+
+    @classmethod
+    def sendMerge(cls, template: MailMergeTemplate, recipients: Iterable[dict], background: bool = False, timeout: float = None) -> dict:
+        """
+        Render and send `template` once per recipient, pulling recipients lazily from any iterable.
+
+        Each item is a dict of template fields that includes the recipient address under
+        `template.recipient_field`. Pass a generator to keep memory flat for very long lists.
+        By default messages are rendered and sent one at a time on the calling thread, through the
+        session pool when configured; failures are logged and counted. With `background=True` each
+        recipient is handed to the send queue and rendered on its workers; `put` blocks while the
+        queue is full (for up to `timeout` seconds), so the generator is only read as fast as mail
+        goes out.
+
+        Returns {'sent', 'failed', 'queued', 'seconds'}.
+
+        Example Usage:
+        template = MailMergeTemplate('News for $name', 'Hello $name,\n\nYour code is $code.', html='<p>Hello $name, your code is <b>$code</b>.</p>')
+        Emailer.configureSession(pool_size=1, max_messages=500)
+        Emailer.sendMerge(template, ({'email': user.email, 'name': user.name, 'code': user.code} for user in users))
+        """
+        started = time.monotonic()
+        counts = {'sent': 0, 'failed': 0, 'queued': 0}
+
+        if background:
+            if cls._queue is None or cls._queue.closed:
+                cls.startQueue()
+            for fields in recipients:
+                cls._queue.put((fields.get(template.recipient_field), template, fields), timeout=timeout)
+                counts['queued'] += 1
+        else:
+            from_address = template.sender or cls.accessCredentials()[0]
+            for fields in recipients:
+                try:
+                    cls._deliver(*template.render(fields, from_address))
+                    counts['sent'] += 1
+                except Exception as e:
+                    logger.error(f'Failed to send email to {fields.get(template.recipient_field)}: {e}')
+                    counts['failed'] += 1
+
+        counts['seconds'] = time.monotonic() - started
+        return counts
+
+    @classmethod
+    def sendEmail(cls, recipient, subject, body, sender=None):
+        try:
+            cls._deliver(*cls._buildMessage(recipient, subject, body, sender))
         except SMTPException as e:
             logger.error(f'Failed to send email: {e}')
         except Exception as e:
             logger.error(f'Unexpected error: {e}')
 
-# Example usage
+    @classmethod
+    def _connect(cls) -> smtplib.SMTP:
+        """Open an authenticated SMTP connection."""
+        login_email, login_password, smtp_server, smtp_port = cls.accessCredentials()
+
+        server = smtplib.SMTP(smtp_server, smtp_port)
+        try:
+            if cls.starttls:
+                server.starttls()  # Secure the connection
+            server.login(login_email, login_password)
+        except BaseException:
+            server.close()
+            raise
+        return server
+
+    @classmethod
+    def _deliver(cls, from_address: str, recipient, message: str | bytes) -> None:
+        """Send one message, through a pooled session when configured; raises on failure."""
+        pool = cls._sessions
+        if pool is None:
+            server = cls._connect()
+            try:
+                cls._sendmail(server, from_address, recipient, message)
+            finally:
+                try:
+                    server.quit()
+                except SMTPException:
+                    server.close()
+            return
+
+        session = pool.acquire()
+        try:
+            try:
+                cls._sendmail(session.server, from_address, recipient, message)
+            except SMTPServerDisconnected:
+                logger.info('SMTP session dropped mid-send; reconnecting.')
+                session.reconnect()
+                cls._sendmail(session.server, from_address, recipient, message)
+        except (SMTPResponseException, SMTPRecipientsRefused):
+            pool.release(session)  # The server rejected this message; the session itself is still usable
+            raise
+        except BaseException:
+            pool.release(session, discard=True)
+            raise
+        session.sent += 1
+        pool.release(session)
+
+    @classmethod
+    def _sendmail(cls, server: smtplib.SMTP, from_address: str, recipient, message: str | bytes) -> None:
+        """sendmail, declaring 8BITMIME for non-ASCII bytes or re-encoding them as base64 if the server lacks it."""
+        message, mail_options = cls._mailOptions(message, server.has_extn('8bitmime'))
+        server.sendmail(from_address, recipient, message, mail_options)
+
+# Example usage (run from the repository root: python -m components.emailer)
 if __name__ == '__main__':
     try:
         Emailer.setCredentials(
@@ -81,5 +688,9 @@ if __name__ == '__main__':
 
         Emailer.sendEmail(recipient, subject, body)
 
+        # mail merge
+        template = MailMergeTemplate('Hello $name', 'Hi $name, this is a test email.')
+        Emailer.sendMerge(template, [{'email': recipient, 'name': 'Tester'}])
+
     except Exception as e:
         print(f'Error occurred: {e}')
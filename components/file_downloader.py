@@ -1,14 +1,47 @@
-import os, requests
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import hashlib, json, os, re, requests, threading, time
+from requests.adapters import HTTPAdapter
+from typing import Callable, Iterable, NamedTuple
+from urllib.parse import urlsplit
+
+CHUNK_SIZE = 1024 * 1024
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+JOURNAL_INTERVAL = 1.0  # Seconds between journal saves while ranges stream in
+CONTENT_RANGE = re.compile(r'bytes (\d+)-(\d+)/(\d+)')
+
+class DownloadError(IOError):
+    """A range that ended early or came back whole; retried by download_segmented."""
+
+class DownloadResult(NamedTuple):
+    url: str
+    path: str
+    ok: bool
+    size: int  # Bytes in the finished file (0 on failure)
+    seconds: float
+    error: str | None
 
 class FileDownloader:
 
     @staticmethod
-    def download_file(url: str, save_path: str) -> None:
-        """Downloads the file from a secured URL, ensuring the directory exists."""
+    def download_file(url: str, save_path: str, segments: int = 1, resume: bool = False, sha256: str = None) -> bool:
+        """
+        Downloads the file from a secured URL, ensuring the directory exists, and returns whether it succeeded.
+        With segments > 1 the file is fetched as that many concurrent byte ranges, and with `resume` a
+        `.part` file left by an earlier interrupted call is continued instead of restarted; `sha256` is
+        checked before the file is put in place (see download_segmented).
+        """
         try:
             # Ensure the directory exists
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
 
+            if segments > 1 or resume or sha256:
+                if not resume:
+                    FileDownloader._discard(save_path + '.part', save_path + '.part.json')
+                FileDownloader.download_segmented(url, save_path, segments=segments, sha256=sha256)
+                print(f'File downloaded successfully to {save_path}')
+                return True
+
             response = requests.get(url, stream=True)
             response.raise_for_status()
 
@@ -16,14 +49,378 @@ class FileDownloader:
                 for chunk in response.iter_content(chunk_size=8192):
                     f.write(chunk)
             print(f'File downloaded successfully to {save_path}')
+            return True
         except requests.exceptions.SSLError as ssl_err:
             print(f'SSL error occurred: {ssl_err}')
         except requests.exceptions.RequestException as req_err:
             print(f'Error during requests to {url}: {req_err}')
+        except ValueError as verify_err:
+            print(f'Verification failed: {verify_err}')
         except Exception as e:
             print(f'An error occurred: {e}')
+        return False
+
+    @staticmethod
+    def download_segmented(url: str, save_path: str, segments: int = 4, min_segment_size: int = MIN_SEGMENT_SIZE, chunk_size: int = CHUNK_SIZE, session: requests.Session = None, timeout: float = 30, retries: int = 3, backoff: float = 1.0, max_backoff: float = 30.0, sha256: str = None, signature: bytes = None, public_key=None, on_bytes: Callable[[int], None] = None) -> int:
+        """
+        Downloads a file as up to `segments` concurrent HTTP byte ranges and returns its size; raises on failure.
+
+        A `Range: bytes=0-0` probe reveals whether the server supports ranges and the total size. The
+        file is then preallocated and each range is written in place at its own offset, through its
+        own file handle, as it streams in. Segments are at least `min_segment_size` bytes. When the
+        server ignores ranges, its full response to the probe is streamed instead.
+
+        Data goes to `save_path + '.part'`, with a `.part.json` journal of how far each range got.
+        Interrupted transfers are retried up to `retries` times with exponential backoff. A later call
+        resumes from the journal too. Resumed ranges carry `If-Range` with the stored ETag or
+        Last-Modified, so a file that changed on the server restarts from zero instead of being stitched
+        together. The download is checked against `sha256` (hex) and/or a DigitalSigning `signature`
+        made with `public_key`'s private key, and renamed into place only when they pass. Single-segment
+        downloads are hashed as the bytes stream in; with several segments the finished file is hashed.
+
+        `on_bytes(count)` is called from the download threads as data arrives, e.g. to track throughput.
+        """
+        own_session = session is None
+        if own_session:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=segments)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        part_path = save_path + '.part'
+        journal_path = part_path + '.json'
+
+        try:
+            for attempt in range(retries + 1):
+                try:
+                    total, digest = FileDownloader._transfer(session, url, part_path, journal_path, segments, min_segment_size, chunk_size, timeout, hashing=bool(sha256 or signature), on_bytes=on_bytes)
+                    break
+                except Exception as e:
+                    if attempt == retries or not FileDownloader.isTransient(e):
+                        raise
+                    time.sleep(min(max_backoff, backoff * 2 ** attempt))
+
+            if sha256 or signature:
+                if digest is None:
+                    digest = FileDownloader._hashPrefix(part_path, os.path.getsize(part_path), chunk_size).digest()
+                if sha256 and digest.hex() != sha256.lower():
+                    FileDownloader._discard(part_path, journal_path)
+                    raise ValueError(f'SHA-256 mismatch for {url}: expected {sha256.lower()}, got {digest.hex()}')
+                if signature:
+                    from .digital_signing import DigitalSigning  # Only signature checks need cryptography
+                    if not DigitalSigning.verifyDigest(digest, signature, public_key):
+                        FileDownloader._discard(part_path, journal_path)
+                        raise ValueError(f'Signature verification failed for {url}')
+
+            os.replace(part_path, save_path)
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+            return total
+        finally:
+            if own_session:
+                session.close()
+
+    @staticmethod
+    def isTransient(error: Exception) -> bool:
+        """Dropped connections, timeouts, short ranges and 5xx/429 replies are worth retrying; a malformed URL or header is not."""
+        if isinstance(error, (requests.exceptions.URLRequired, requests.exceptions.MissingSchema, requests.exceptions.InvalidSchema, requests.exceptions.InvalidURL, requests.exceptions.InvalidHeader)):
+            return False
+        if isinstance(error, requests.exceptions.HTTPError):
+            return error.response is not None and (error.response.status_code >= 500 or error.response.status_code == 429)
+        return isinstance(error, (requests.exceptions.RequestException, DownloadError))
+
+    @staticmethod
+    def _transfer(session: requests.Session, url: str, part_path: str, journal_path: str, segments: int, min_segment_size: int, chunk_size: int, timeout: float, hashing: bool, on_bytes: Callable[[int], None] = None) -> tuple:
+        """One download attempt; returns (size, SHA-256 digest if it was computed while streaming, else None)."""
+        journal = FileDownloader._loadJournal(journal_path, part_path)
+        # A fresh single-segment download asks for the whole file as one range and streams the reply, saving a round trip
+        whole = segments == 1 and journal is None
+        probe = session.get(url, headers={'Range': 'bytes=0-' if whole else 'bytes=0-0', 'Accept-Encoding': 'identity'}, stream=True, timeout=timeout)
+        total = FileDownloader._rangeTotal(probe)
+        if total is None and probe.status_code in (206, 416):
+            # Range answered without a usable size (or an empty file): fall back to a plain request
+            probe.close()
+            probe = session.get(url, headers={'Accept-Encoding': 'identity'}, stream=True, timeout=timeout)
+        probe.raise_for_status()
+
+        if total is None:
+            # Single stream; cannot resume, so any previous partial download is dropped
+            FileDownloader._discard(part_path, journal_path)
+            digest = hashlib.sha256() if hashing else None
+            size = 0
+            with probe, open(part_path, 'wb') as f:
+                for chunk in probe.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    size += len(chunk)
+                    if digest:
+                        digest.update(chunk)
+                    if on_bytes:
+                        on_bytes(len(chunk))
+            return size, digest.digest() if digest else None
+
+        validator = FileDownloader._validator(probe)
+        if not whole:
+            probe.close()
+        if journal and (not validator or journal['validator'] != validator or journal['total'] != total):
+            journal = None  # The remote file changed (or cannot be identified): start over
+        if journal is None:
+            with open(part_path, 'wb') as f:
+                f.truncate(total)  # Preallocate so every segment can write at its offset
+            journal = {'url': url, 'total': total, 'validator': validator, 'segments': [[start, end, start] for start, end in FileDownloader._splitRanges(total, segments, min_segment_size)]}
+            FileDownloader._saveJournal(journal_path, journal)
+
+        # Each segment is [start, end, next offset to fetch]
+        pending = [segment for segment in journal['segments'] if segment[2] <= segment[1]]
+        digest = None
+        if hashing and len(journal['segments']) == 1:
+            # Bytes arrive in order from offset 0: hash them as they stream, after any prefix already on disk
+            digest = FileDownloader._hashPrefix(part_path, journal['segments'][0][2], chunk_size)
+        stop = threading.Event()
+        lock = threading.Lock()
+        saved_at = [time.monotonic()]
+
+        def checkpoint(force: bool = False) -> None:
+            with lock:
+                if force or time.monotonic() - saved_at[0] >= JOURNAL_INTERVAL:
+                    FileDownloader._saveJournal(journal_path, journal)
+                    saved_at[0] = time.monotonic()
+
+        try:
+            if whole:
+                with probe:
+                    FileDownloader._streamRange(probe, part_path, journal['segments'][0], chunk_size, stop, checkpoint, on_bytes, digest)
+            elif pending:
+                with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix='FileDownloader') as executor:
+                    futures = [executor.submit(FileDownloader._fetchRange, session, probe.url, part_path, segment, journal['validator'], chunk_size, timeout, stop, checkpoint, on_bytes, digest) for segment in pending]
+                    try:
+                        for future in futures:
+                            future.result()
+                    except BaseException:
+                        stop.set()  # Other segments stop at their next chunk
+                        raise
+        finally:
+            checkpoint(force=True)
+        return total, digest.digest() if digest else None
+
+    @staticmethod
+    def _hashPrefix(path: str, length: int, chunk_size: int) -> 'hashlib._Hash':
+        """A SHA-256 object fed with the first `length` bytes of a file, ready to continue with what follows."""
+        digest = hashlib.sha256()
+        if not length:
+            return digest
+        with open(path, 'rb', buffering=0) as f:
+            buffer = bytearray(min(chunk_size, length))
+            view = memoryview(buffer)
+            while length:
+                size = f.readinto(view[:min(len(buffer), length)])
+                if not size:
+                    raise DownloadError(f'{path} is shorter than its journal says')
+                digest.update(view[:size])
+                length -= size
+        return digest
+
+    @staticmethod
+    def _loadJournal(journal_path: str, part_path: str) -> dict | None:
+        if not (os.path.exists(journal_path) and os.path.exists(part_path)):
+            return None
+        try:
+            with open(journal_path, 'r', encoding='utf-8') as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return journal if os.path.getsize(part_path) == journal.get('total') else None
+
+    @staticmethod
+    def _saveJournal(journal_path: str, journal: dict) -> None:
+        temp_path = journal_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(journal, f)
+        os.replace(temp_path, journal_path)
+
+    @staticmethod
+    def _discard(part_path: str, journal_path: str) -> None:
+        for path in (part_path, journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def _rangeTotal(response: requests.Response) -> int | None:
+        """The full size from a 206 reply to a range probe, or None when ranges are unsupported."""
+        if response.status_code != 206:
+            return None
+        match = CONTENT_RANGE.fullmatch(response.headers.get('Content-Range', ''))
+        return int(match.group(3)) if match else None
+
+    @staticmethod
+    def _validator(response: requests.Response) -> str | None:
+        """A strong ETag or Last-Modified date for If-Range; weak ETags are not allowed there."""
+        etag = response.headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            return etag
+        return response.headers.get('Last-Modified')
+
+    @staticmethod
+    def _splitRanges(total: int, segments: int, min_segment_size: int) -> list:
+        """Split [0, total) into at most `segments` inclusive (start, end) ranges of at least `min_segment_size` bytes."""
+        count = max(1, min(segments, total // max(1, min_segment_size)))
+        size = -(-total // count)
+        return [(start, min(start + size, total) - 1) for start in range(0, total, size)]
+
+    @staticmethod
+    def _fetchRange(session: requests.Session, url: str, path: str, segment: list, validator: str | None, chunk_size: int, timeout: float, stop: threading.Event, checkpoint: Callable[[], None], on_bytes: Callable[[int], None] = None, digest: 'hashlib._Hash' = None) -> None:
+        """Request the rest of one [start, end, next] segment and stream it into place."""
+        headers = {'Range': f'bytes={segment[2]}-{segment[1]}', 'Accept-Encoding': 'identity'}
+        if validator:
+            headers['If-Range'] = validator
+        with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            FileDownloader._streamRange(response, path, segment, chunk_size, stop, checkpoint, on_bytes, digest)
+
+    @staticmethod
+    def _streamRange(response: requests.Response, path: str, segment: list, chunk_size: int, stop: threading.Event, checkpoint: Callable[[], None], on_bytes: Callable[[int], None] = None, digest: 'hashlib._Hash' = None) -> None:
+        """Write a 206 body at the segment's offset, advancing `next` only after the bytes reach the file; feeds `digest` when given."""
+        requested = f'bytes={segment[2]}-{segment[1]}'
+        if response.status_code != 206:
+            raise DownloadError(f'Range {requested} answered with status {response.status_code}; the file changed or ranges were dropped')
+
+        with open(path, 'r+b') as f:
+            f.seek(segment[2])
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if stop.is_set():
+                    return
+                f.write(chunk)
+                f.flush()  # In the OS before the journal can record it
+                if digest:
+                    digest.update(chunk)
+                segment[2] += len(chunk)
+                checkpoint()
+                if on_bytes:
+                    on_bytes(len(chunk))
+        if segment[2] != segment[1] + 1:
+            raise DownloadError(f'Range {requested} ended at byte {segment[2]}')
+
+class DownloadManager:
+    """
+    Downloads batches of files on a bounded worker pool over one shared, pooled requests.Session.
+
+    Keep-alive connections are reused across files. The adapter holds at most `per_host` connections
+    to each host and blocks for a free one beyond that. At most `per_host` files per host are in
+    flight at once; further jobs for that host wait in a per-host queue and are only handed to a
+    worker when one of its files finishes, so one slow host cannot take every worker. Each file goes through
+    FileDownloader.download_segmented, so it is retried, resumable and optionally verified. Errors
+    are returned in the per-file results instead of being printed.
+    """
+
+    def __init__(self, workers: int = 8, per_host: int = 4, segments: int = 1, retries: int = 3, timeout: float = 30, progress_interval: float = 1.0) -> None:
+        self.workers = workers
+        self.per_host = per_host
+        self.segments = segments
+        self.retries = retries
+        self.timeout = timeout
+        self.progress_interval = progress_interval
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max(10, workers), pool_maxsize=per_host, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._lock = threading.Lock()
+        self._progress = None
+        self._reported_at = 0.0
+        self._counters = {'files_total': 0, 'files_done': 0, 'files_failed': 0, 'bytes': 0}
+        self._started = time.monotonic()
+
+    def download(self, jobs: Iterable[tuple], progress: Callable[[dict], None] = None) -> list:
+        """
+        Downloads (url, path) jobs, or (url, path, options) where options are extra download_segmented
+        keyword arguments such as sha256. Returns one DownloadResult per job, in job order.
+        `progress(stats)` is called about every `progress_interval` seconds and once at the end.
 
-# Example usage
+        Example Usage:
+        with DownloadManager(workers=16, per_host=6) as manager:
+            results = manager.download([(url, os.path.join('assets', name)) for name, url in assets], progress=print)
+        failed = [result for result in results if not result.ok]
+        """
+        jobs = [tuple(job) for job in jobs]
+        with self._lock:
+            self._progress = progress
+            self._reported_at = time.monotonic()
+            self._counters = {'files_total': len(jobs), 'files_done': 0, 'files_failed': 0, 'bytes': 0}
+            self._started = time.monotonic()
+
+        queues = {}  # host -> deque of job indexes not yet handed to a worker
+        for index, job in enumerate(jobs):
+            queues.setdefault(urlsplit(job[0]).netloc, deque()).append(index)
+        active = dict.fromkeys(queues, 0)
+        results = [None] * len(jobs)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='DownloadManager') as executor:
+            running = {}  # future -> (job index, host)
+
+            def schedule() -> None:
+                # Only submit jobs whose host has a free slot, so no worker ever waits on a host
+                for host, waiting in queues.items():
+                    while waiting and active[host] < self.per_host:
+                        index = waiting.popleft()
+                        active[host] += 1
+                        running[executor.submit(self._run, *jobs[index])] = (index, host)
+
+            schedule()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index, host = running.pop(future)
+                    active[host] -= 1
+                    results[index] = future.result()
+                schedule()
+        if progress:
+            progress(self.stats())
+        return results
+
+    def stats(self) -> dict:
+        """Files done/failed/total, bytes received, elapsed seconds and aggregate bytes per second."""
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            return dict(self._counters, seconds=elapsed, bytes_per_sec=self._counters['bytes'] / elapsed if elapsed else 0.0)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> 'DownloadManager':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self, url: str, path: str, options: dict = None) -> DownloadResult:
+        started = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            size = FileDownloader.download_segmented(url, path, segments=self.segments, session=self.session, timeout=self.timeout, retries=self.retries, on_bytes=self._received, **(options or {}))
+            result = DownloadResult(url, path, True, size, time.monotonic() - started, None)
+        except Exception as e:
+            result = DownloadResult(url, path, False, 0, time.monotonic() - started, f'{type(e).__name__}: {e}')
+        with self._lock:
+            self._counters['files_done'] += 1
+            if not result.ok:
+                self._counters['files_failed'] += 1
+        self._report()
+        return result
+
+    def _received(self, count: int) -> None:
+        with self._lock:
+            self._counters['bytes'] += count
+        self._report()
+
+    def _report(self) -> None:
+        """Call the progress callback if `progress_interval` has passed, from whichever worker gets there first."""
+        with self._lock:
+            now = time.monotonic()
+            if self._progress is None or now - self._reported_at < self.progress_interval:
+                return
+            self._reported_at = now
+        self._progress(self.stats())
+
+# Example usage (run from the repository root: python -m components.file_downloader)
 if __name__ == '__main__':
     # Dropbox share link (make sure to change `dl=0` to `dl=1` for direct download)
     dropbox_share_link = 'https://www.dropbox.com/scl/fi/jexp0mtauduc5xbn7afmd/scenes.zip?rlkey=94fqyyeucf5bn4lm3iyf195mj&dl=1'
@@ -33,4 +430,14 @@ if __name__ == '__main__':
 
     # Create an instance of the downloader with the modified Dropbox link
     FileDownloader.download_file(dropbox_share_link, save_path)
-    
\ No newline at end of file
+
+    # Same file as 8 concurrent byte ranges (falls back to one stream if the server does not support ranges)
+    FileDownloader.download_file(dropbox_share_link, save_path, segments=8)
+
+    # Resumable: a dropped transfer is retried and continues from the .part file and its journal
+    FileDownloader.download_segmented(dropbox_share_link, save_path, segments=8, retries=5)
+
+    # Many files at once over shared keep-alive connections
+    with DownloadManager(workers=8, per_host=4) as manager:
+        results = manager.download([(dropbox_share_link, os.path.join(os.path.dirname(save_path), f'scenes_{index}.zip')) for index in range(3)], progress=print)
+    print(results)
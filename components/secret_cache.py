@@ -0,0 +1,70 @@
+from cryptography.fernet import Fernet
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class SecretCache:
+    """
+    Decrypt-once holder for a set of Fernet-encrypted secrets.
+
+    The ciphertexts and key are stored by `rotate()`. The first `get()` decrypts everything
+    once and keeps the plaintext in mutable buffers until `ttl` seconds pass, `clear()` is
+    called, or the secrets are rotated. The buffers are overwritten with zeros when they are
+    dropped. This is best effort: the bytes returned by Fernet and the str values handed to
+    callers are immutable Python objects and cannot be wiped.
+    """
+
+    def __init__(self, ttl: float = None) -> None:
+        self.ttl = ttl
+        self._symmetric_key = None
+        self._encrypted = {}
+        self._plaintext = {}  # name -> bytearray
+        self._decrypted_at = None
+        self._lock = threading.Lock()
+
+    def rotate(self, symmetric_key: bytes, **encrypted: bytes) -> None:
+        """Replace the key and ciphertexts, dropping any decrypted values."""
+        with self._lock:
+            self._symmetric_key = symmetric_key
+            self._encrypted = dict(encrypted)
+            self._wipe()
+
+    def get(self, *names: str) -> tuple:
+        """Return the plaintext of the named secrets, decrypting all of them at most once per lifetime."""
+        with self._lock:
+            if self._decrypted_at is not None and self.ttl is not None and time.monotonic() - self._decrypted_at > self.ttl:
+                self._wipe()
+            if self._decrypted_at is None:
+                self._decrypt()
+            return tuple(self._plaintext[name].decode() for name in names)
+
+    def clear(self) -> None:
+        """Zero and drop the decrypted values; the next `get()` decrypts again."""
+        with self._lock:
+            self._wipe()
+
+    def _decrypt(self) -> None:
+        if self._symmetric_key is None:
+            raise ValueError('SecretCache.error: no secrets set')
+        cipher = Fernet(self._symmetric_key)
+        self._plaintext = {name: bytearray(cipher.decrypt(value)) for name, value in self._encrypted.items()}
+        self._decrypted_at = time.monotonic()
+        logger.debug(f'Decrypted {len(self._plaintext)} secret(s).')
+
+    def _wipe(self) -> None:
+        for buffer in self._plaintext.values():
+            buffer[:] = bytes(len(buffer))
+        self._plaintext = {}
+        self._decrypted_at = None
+
+# Example usage
+if __name__ == '__main__':
+    key = Fernet.generate_key()
+    cipher = Fernet(key)
+
+    secrets = SecretCache(ttl=300)
+    secrets.rotate(key, user=cipher.encrypt(b'admin'), password=cipher.encrypt(b'hunter2'))
+    print(secrets.get('user', 'password'))
+    secrets.clear()
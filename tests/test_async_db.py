@@ -0,0 +1,156 @@
+import asyncio
+from contextlib import aclosing
+import time
+import unittest
+
+from mysql.connector import FieldType
+
+from components.async_db import AsyncDB
+from components.db import DB
+
+ROWS = [(index, f'user{index}') for index in range(10)]
+DESCRIPTION = [
+    ('id', FieldType.LONGLONG, None, None, None, None, 0, 0, 63),
+    ('name', FieldType.VAR_STRING, None, None, None, None, 1, 0, 45),
+]
+
+class FakeCursor:
+    """Cursor over a fixed result set; unbuffered cursors leave the connection with an unread result."""
+
+    def __init__(self, conn: 'FakeConnection', buffered: bool = True) -> None:
+        self.conn = conn
+        self.buffered = buffered
+        self.description = None
+        self.rowcount = -1
+        self._rows = []
+
+    def execute(self, query: str, params: tuple = ()) -> None:
+        self.description = DESCRIPTION
+        self._rows = list(ROWS)
+        self.rowcount = len(self._rows)
+        self.conn.unread_result = not self.buffered
+
+    def fetchall(self) -> list:
+        rows, self._rows = self._rows, []
+        self.conn.unread_result = False
+        return rows
+
+    def fetchmany(self, size: int) -> list:
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        if not rows:
+            self.conn.unread_result = False
+        return rows
+
+    def close(self) -> None:
+        pass
+
+class FakeConnection:
+    """Just enough of MySQLConnection for DB's pool, sessions and streams."""
+
+    def __init__(self) -> None:
+        self.unread_result = False
+        self.in_transaction = False
+        self.closed = False
+
+    def cursor(self, buffered: bool = True, prepared: bool = False) -> FakeCursor:
+        return FakeCursor(self, buffered=buffered or prepared)
+
+    def is_connected(self) -> bool:
+        return not self.closed
+
+    def close(self) -> None:
+        self.closed = True
+
+    def rollback(self) -> None:
+        self.in_transaction = False
+
+    def commit(self) -> None:
+        pass
+
+    def consume_results(self) -> None:
+        self.unread_result = False
+
+class FakeDB(DB):
+    """DB backend whose connections are in-memory stand-ins."""
+
+    @classmethod
+    def connect(cls) -> FakeConnection:
+        return FakeConnection()
+
+class SlowCursor(FakeCursor):
+
+    def fetchmany(self, size: int) -> list:
+        time.sleep(0.3)
+        return super().fetchmany(size)
+
+class SlowConnection(FakeConnection):
+
+    def cursor(self, buffered: bool = True, prepared: bool = False) -> FakeCursor:
+        return SlowCursor(self, buffered=buffered or prepared)
+
+class SlowDB(DB):
+    """DB backend whose unbuffered fetches take a while."""
+
+    @classmethod
+    def connect(cls) -> SlowConnection:
+        return SlowConnection()
+
+class TestAsyncDB(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncTearDown(self) -> None:
+        await AsyncDB.close()
+
+    async def test_get_rows(self) -> None:
+        AsyncDB.configure(max_workers=2, backend=FakeDB)
+        self.assertEqual(await AsyncDB.get_rows('users'), ROWS)
+
+    async def test_open_streams_do_not_starve_calls(self) -> None:
+        AsyncDB.configure(max_workers=2, max_streams=2, wait_timeout=1.0, backend=FakeDB)
+        async with aclosing(AsyncDB.iter_rows('users', batch_size=2)) as first, aclosing(AsyncDB.iter_rows('users', batch_size=2)) as second:
+            self.assertEqual(await anext(first), ROWS[0])
+            self.assertEqual(await anext(second), ROWS[0])
+            # Both streams hold a pooled connection between batches; calls still get their own
+            results = await asyncio.wait_for(asyncio.gather(*(AsyncDB.get_rows('users') for _ in range(4))), 5)
+            self.assertEqual(results, [ROWS] * 4)
+
+    async def test_stream_waits_for_slot(self) -> None:
+        AsyncDB.configure(max_workers=2, max_streams=1, backend=FakeDB)
+        first = AsyncDB.iter_rows('users', batch_size=2)
+        self.assertEqual(await anext(first), ROWS[0])
+
+        second = AsyncDB.iter_rows('users', batch_size=2)
+        waiting = asyncio.ensure_future(anext(second))
+        await asyncio.sleep(0.1)
+        self.assertFalse(waiting.done())
+
+        await first.aclose()
+        self.assertEqual(await asyncio.wait_for(waiting, 5), ROWS[0])
+        await second.aclose()
+
+    async def test_early_close_releases_connection(self) -> None:
+        AsyncDB.configure(max_workers=2, max_streams=1, backend=FakeDB)
+        async with aclosing(AsyncDB.iter_rows_as_dict('users', batch_size=2)) as rows:
+            self.assertEqual(await anext(rows), {'id': 0, 'name': 'user0'})
+        # The abandoned stream's connection had an unread result, so it was dropped
+        self.assertEqual(AsyncDB.backend._pool.stats()['in_use'], 0)
+        self.assertEqual(len([row async for row in AsyncDB.iter_rows('users', batch_size=3)]), len(ROWS))
+
+    async def test_cancel_mid_fetch_releases_connection(self) -> None:
+        AsyncDB.configure(max_workers=2, max_streams=1, backend=SlowDB)
+
+        async def consume():
+            async for _ in AsyncDB.iter_rows('users', batch_size=2):
+                pass
+
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.1)  # The first fetchmany is now running on a worker
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(AsyncDB.backend._pool.stats()['in_use'], 0)
+        # The stream slot was released too
+        async with aclosing(AsyncDB.iter_rows('users', batch_size=20)) as rows:
+            self.assertEqual(await asyncio.wait_for(anext(rows), 5), ROWS[0])
+
+if __name__ == '__main__':
+    unittest.main()
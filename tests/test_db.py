@@ -0,0 +1,155 @@
+import base64
+import csv
+from datetime import datetime
+from decimal import Decimal
+import io
+import json
+import time
+import unittest
+
+from mysql.connector import FieldType
+
+from components.db import ConnectionPool, DB, instrumented
+
+class ScanDB(DB):
+    """DB whose `scan` streams items, spending `delay` seconds in the fetch phase for each."""
+
+    @classmethod
+    @instrumented('scan')
+    def scan(cls, table_name: str, delay: float = 0.0):
+        for index in range(3):
+            with cls._phase('fetch'):
+                time.sleep(delay)
+            yield index
+
+class TestPageCursor(unittest.TestCase):
+
+    def test_round_trip(self) -> None:
+        for value in (42, 'abc', datetime(2024, 1, 2, 3, 4, 5), Decimal('12.50'), b'\x00\xff'):
+            for descending in (False, True):
+                cursor = DB._encodePageCursor('events', 'id', value, descending)
+                self.assertEqual(DB._decodePageCursor(cursor, 'events', 'id', descending), value)
+
+    def test_direction_mismatch_is_rejected(self) -> None:
+        cursor = DB._encodePageCursor('events', 'id', 42, descending=True)
+        with self.assertRaisesRegex(ValueError, 'descending'):
+            DB._decodePageCursor(cursor, 'events', 'id', descending=False)
+
+    def test_other_table_is_rejected(self) -> None:
+        cursor = DB._encodePageCursor('events', 'id', 42)
+        with self.assertRaisesRegex(ValueError, 'belongs to events.id'):
+            DB._decodePageCursor(cursor, 'users', 'id')
+
+    def test_malformed_cursor_is_rejected(self) -> None:
+        for payload in (b'[1, 2]', b'7', b'"text"', b'{"table": "events"}', b'not json'):
+            with self.assertRaisesRegex(ValueError, 'malformed cursor'):
+                DB._decodePageCursor(base64.urlsafe_b64encode(payload).decode(), 'events', 'id')
+
+class TestSelectQuery(unittest.TestCase):
+
+    def test_condition_order_does_not_change_the_statement(self) -> None:
+        first = DB._selectQuery('users', {'age': 30, 'city': 'Oslo'}, limit=10)
+        second = DB._selectQuery('users', {'city': 'Oslo', 'age': 30}, limit=10)
+        self.assertEqual(first, second)
+        self.assertEqual(first, ('SELECT * FROM users WHERE age = %s AND city = %s LIMIT %s', (30, 'Oslo', 10)))
+
+class TestExportWriters(unittest.TestCase):
+
+    DESCRIPTION = [
+        ('id', FieldType.LONGLONG, None, None, None, None, 0, 0, 63),
+        ('data', FieldType.BLOB, None, None, None, None, 1, 0, 63),
+        ('tags', FieldType.STRING, None, None, None, None, 1, 0, 45),
+    ]
+    ROWS = [(1, b'\x00\xff', {'b', 'a', 'c'}), (2, None, set())]
+
+    def test_csv_renders_blob_and_set(self) -> None:
+        f = io.StringIO(newline='')
+        self.assertEqual(DB._writeCsv(iter([(self.DESCRIPTION, self.ROWS)]), f), 2)
+        self.assertEqual(list(csv.reader(io.StringIO(f.getvalue()))), [['id', 'data', 'tags'], ['1', 'AP8=', 'a,b,c'], ['2', '', '']])
+
+    def test_jsonl_renders_blob_and_set(self) -> None:
+        f = io.StringIO()
+        self.assertEqual(DB._writeJsonl(iter([(self.DESCRIPTION, self.ROWS)]), f), 2)
+        rows = [json.loads(line) for line in f.getvalue().splitlines()]
+        self.assertEqual(rows, [{'id': 1, 'data': 'AP8=', 'tags': 'a,b,c'}, {'id': 2, 'data': None, 'tags': ''}])
+
+    def test_csv_header_on_empty_result(self) -> None:
+        f = io.StringIO(newline='')
+        self.assertEqual(DB._writeCsv(iter([(self.DESCRIPTION, [])]), f), 0)
+        self.assertEqual(f.getvalue().strip(), 'id,data,tags')
+
+class Connection:
+
+    def is_connected(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+class TestConnectionPool(unittest.TestCase):
+
+    def test_fill_opens_min_size_up_front(self) -> None:
+        opened = []
+        pool = ConnectionPool(lambda: opened.append(Connection()) or opened[-1], min_size=3, max_size=5)
+        self.assertEqual(pool.fill(), 3)
+        self.assertEqual(pool.stats(), {'size': 3, 'idle': 3, 'in_use': 0, 'max_size': 5})
+        # A burst of min_size calls reuses the warm connections
+        held = [pool.acquire() for _ in range(3)]
+        self.assertEqual(len(opened), 3)
+        for conn in held:
+            pool.release(conn)
+        self.assertEqual(pool.fill(), 0)
+
+    def test_fill_tops_up_after_discard(self) -> None:
+        pool = ConnectionPool(Connection, min_size=2, max_size=5)
+        pool.fill()
+        pool.release(pool.acquire(), discard=True)
+        self.assertEqual(pool.fill(), 1)
+        self.assertEqual(pool.stats()['idle'], 2)
+
+    def test_configure_pool_warms_up(self) -> None:
+        class WarmDB(DB):
+            _pool = None
+            connect = classmethod(lambda cls: Connection())
+
+        WarmDB.configurePool(min_size=2, max_size=4)
+        try:
+            self.assertEqual(WarmDB._pool.stats()['idle'], 2)
+        finally:
+            WarmDB.closePool()
+
+class TestStreamingInstrumentation(unittest.TestCase):
+
+    def setUp(self) -> None:
+        ScanDB.configureInstrumentation(slow_query_threshold=0.1)
+
+    def tearDown(self) -> None:
+        ScanDB.disableInstrumentation()
+
+    def test_consumer_time_is_not_counted(self) -> None:
+        with self.assertNoLogs('components.db.slow'):
+            for _ in ScanDB.scan('events', delay=0.01):
+                time.sleep(0.1)  # The consumer's own work between items
+        entry = ScanDB.queryStats()['scan:events']
+        self.assertEqual(entry['calls'], 1)
+        self.assertLess(entry['latency']['max'], 0.1)
+        self.assertGreaterEqual(entry['phases']['fetch'], 0.03)
+
+    def test_interleaved_streams_keep_their_own_phases(self) -> None:
+        slow, fast = ScanDB.scan('slow', delay=0.02), ScanDB.scan('fast')
+        for _ in zip(slow, fast):
+            pass
+        fast.close()  # zip stopped at the slow stream's end
+        stats = ScanDB.queryStats()
+        self.assertGreaterEqual(stats['scan:slow']['phases']['fetch'], 0.06)
+        self.assertLess(stats['scan:fast']['phases']['fetch'], 0.02)
+
+    def test_early_close_is_recorded(self) -> None:
+        stream = ScanDB.scan('events')
+        next(stream)
+        stream.close()
+        entry = ScanDB.queryStats()['scan:events']
+        self.assertEqual((entry['calls'], entry['errors']), (1, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,266 @@
+import base64
+import os
+import tempfile
+import unittest
+
+from components.digital_signing import ALGORITHMS, ED25519, ED25519_SHA256, KEY_ALGORITHMS, DigitalSigning, _merkleFold, _merkleLeaf, _merkleLevels
+
+class SigningTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        DigitalSigning.clearKeyCache()
+
+    def path(self, *parts: str) -> str:
+        return os.path.join(self.directory.name, *parts)
+
+    def write(self, relative_path: str, data: bytes) -> str:
+        path = self.path(*relative_path.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+class TestSignatures(SigningTestCase):
+
+    def test_data_round_trip_per_algorithm(self) -> None:
+        data = os.urandom(4096)
+        for algorithm in KEY_ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                private_key, public_key = DigitalSigning.generateKeyPair(algorithm)
+                signature = DigitalSigning.signData(data, private_key)
+                self.assertTrue(DigitalSigning.verifySignature(data, signature, public_key))
+                self.assertFalse(DigitalSigning.verifySignature(data + b'!', signature, public_key))
+                self.assertTrue(DigitalSigning.verifySignature(data, signature, public_key, algorithm=algorithm))
+
+    def test_ed25519_data_signature_is_standard(self) -> None:
+        private_key, public_key = DigitalSigning.generateKeyPair(ED25519)
+        signature = DigitalSigning.signData(b'payload', private_key)
+        public_key.verify(signature, b'payload')  # Plain Ed25519 over the data; raises if not
+
+    def test_file_round_trip_per_algorithm(self) -> None:
+        path = self.write('artifact.bin', os.urandom(3 * 1024 * 1024 + 17))
+        for algorithm in KEY_ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                private_key, public_key = DigitalSigning.generateKeyPair(algorithm)
+                signature = DigitalSigning.signFile(path, private_key, chunk_size=64 * 1024)
+                self.assertTrue(DigitalSigning.verifyFile(path, signature, public_key))
+                self.assertTrue(DigitalSigning.verifyDigest(DigitalSigning.hashFile(path), signature, public_key))
+
+        tampered = self.write('tampered.bin', b'x' * 1024)
+        private_key, public_key = DigitalSigning.generateKeyPair()
+        signature = DigitalSigning.signFile(tampered, private_key)
+        self.write('tampered.bin', b'y' + b'x' * 1023)
+        self.assertFalse(DigitalSigning.verifyFile(tampered, signature, public_key))
+
+    def test_ed25519_file_signature_is_tagged_digest_form(self) -> None:
+        path = self.write('artifact.bin', b'contents')
+        private_key, public_key = DigitalSigning.generateKeyPair(ED25519)
+        signature = DigitalSigning.signFile(path, private_key)
+        self.assertTrue(DigitalSigning.verifyFile(path, signature, public_key, algorithm=ED25519_SHA256))
+        self.assertFalse(DigitalSigning.verifyFile(path, signature, public_key, algorithm=ED25519))
+        self.assertTrue(DigitalSigning.verifySignature(b'contents', signature, public_key, algorithm=ED25519_SHA256))
+
+    def test_signature_file_tag(self) -> None:
+        for algorithm in ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                DigitalSigning.saveSignatureToFile(b'\x00:sig', self.path('sig.bin'), algorithm)
+                self.assertEqual(DigitalSigning.loadSignatureFromFile(self.path('sig.bin'), with_algorithm=True), (algorithm, b'\x00:sig'))
+        DigitalSigning.saveSignatureToFile(b'legacy', self.path('sig.bin'))
+        self.assertEqual(DigitalSigning.loadSignatureFromFile(self.path('sig.bin'), with_algorithm=True), ('rsa-pss', b'legacy'))
+        with self.assertRaises(ValueError):
+            DigitalSigning.saveSignatureToFile(b'sig', self.path('sig.bin'), 'md5')
+
+class TestTaggedSignatures(SigningTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.private_key, self.public_key = DigitalSigning.generateKeyPair(ED25519)
+        self.data = os.urandom(2048)
+        self.file = self.write('artifact.bin', self.data)
+
+    def saveSignature(self, name: str, signature: bytes, algorithm: str = None) -> str:
+        path = self.path(name)
+        DigitalSigning.saveSignatureToFile(signature, path, algorithm)
+        return path
+
+    def test_verify_file_reads_the_tag(self) -> None:
+        digest_form = self.saveSignature('file.sig', DigitalSigning.signFile(self.file, self.private_key), ED25519_SHA256)
+        data_form = self.saveSignature('data.sig', DigitalSigning.signData(self.data, self.private_key), ED25519)
+        untagged_data_form = self.saveSignature('untagged.sig', DigitalSigning.signData(self.data, self.private_key))
+        self.assertTrue(DigitalSigning.verifyFile(self.file, digest_form, self.public_key))
+        self.assertTrue(DigitalSigning.verifyFile(self.file, data_form, self.public_key))
+        self.assertFalse(DigitalSigning.verifyFile(self.file, untagged_data_form, self.public_key))
+        self.assertFalse(DigitalSigning.verifyFile(self.file, data_form, self.public_key, algorithm=ED25519_SHA256))  # Tag and caller disagree
+
+    def test_verify_signature_accepts_tagged_pair(self) -> None:
+        signature = DigitalSigning.signFile(self.file, self.private_key)
+        path = self.saveSignature('file.sig', signature, ED25519_SHA256)
+        self.assertTrue(DigitalSigning.verifySignature(self.data, DigitalSigning.loadSignatureFromFile(path, with_algorithm=True), self.public_key))
+        self.assertTrue(DigitalSigning.verifySignature(self.data, path, self.public_key))
+        self.assertFalse(DigitalSigning.verifySignature(self.data, signature, self.public_key))
+
+    def test_verify_many_with_algorithms(self) -> None:
+        data_signature = DigitalSigning.signData(self.data, self.private_key)
+        items = [
+            (self.file, data_signature, ED25519),
+            (self.file, self.saveSignature('data.sig', data_signature, ED25519)),
+            (self.file, DigitalSigning.signFile(self.file, self.private_key)),
+            (self.data, DigitalSigning.signFile(self.file, self.private_key), ED25519_SHA256),
+            (self.file, data_signature),
+            (self.file, data_signature, 'rsa-pss'),
+        ]
+        results = DigitalSigning.verifyMany(items, self.public_key, workers=1)
+        self.assertEqual([result.valid for result in results], [True, True, True, True, False, False])
+        self.assertIn('give algorithm "ed25519"', results[4].error)
+        self.assertEqual(results[5].error, 'ValueError: rsa-pss signature cannot be checked with a ed25519 key')
+
+class TestKeyCache(SigningTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.interval = DigitalSigning.key_check_interval
+
+    def tearDown(self) -> None:
+        DigitalSigning.key_check_interval = self.interval
+        super().tearDown()
+
+    def test_rotated_key_file_is_reloaded(self) -> None:
+        key_path = self.path('public.pem')
+        _, first = DigitalSigning.generateKeyPair(ED25519)
+        DigitalSigning.saveKeyToFile(first, key_path)
+        loaded = DigitalSigning.loadKeyFromFile(key_path)
+        self.assertIs(DigitalSigning.loadKeyFromFile(key_path), loaded)  # Served from the cache
+
+        _, second = DigitalSigning.generateKeyPair(ED25519)
+        DigitalSigning.saveKeyToFile(second, key_path)
+        os.utime(key_path, ns=(0, os.stat(key_path).st_mtime_ns + 10 ** 9))  # Make the change visible even on coarse mtime clocks
+        DigitalSigning.key_check_interval = 60
+        self.assertIs(DigitalSigning.loadKeyFromFile(key_path), loaded)  # Still trusted within the interval
+        DigitalSigning.key_check_interval = 0
+        self.assertEqual(DigitalSigning.loadKeyFromFile(key_path).public_bytes_raw(), second.public_bytes_raw())
+
+    def test_algorithm_check(self) -> None:
+        key_path = self.path('public.pem')
+        _, public_key = DigitalSigning.generateKeyPair(ED25519)
+        DigitalSigning.saveKeyToFile(public_key, key_path)
+        self.assertIsNotNone(DigitalSigning.loadKeyFromFile(key_path, algorithm=ED25519_SHA256))
+        with self.assertRaises(ValueError):
+            DigitalSigning.loadKeyFromFile(key_path, algorithm='rsa-pss')
+
+    def test_preload_detects_private_keys(self) -> None:
+        private_key, public_key = DigitalSigning.generateKeyPair('ecdsa-p256')
+        DigitalSigning.saveKeyToFile(private_key, self.path('a_private.pem'), private=True)
+        DigitalSigning.saveKeyToFile(public_key, self.path('b_public.pem'))
+        self.assertEqual(DigitalSigning.preloadKeys(self.directory.name), [self.path('a_private.pem'), self.path('b_public.pem')])
+
+class TestVerifyMany(SigningTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.private_key, self.public_key = DigitalSigning.generateKeyPair()
+        self.items = []
+        for index in range(6):
+            path = self.write(f'file{index}.bin', os.urandom(1024 + index))
+            self.items.append((path, DigitalSigning.signFile(path, self.private_key)))
+            data = os.urandom(100 + index)
+            self.items.append((data, DigitalSigning.signData(data, self.private_key)))
+        self.items[3] = (self.items[3][0], self.items[1][1])  # Someone else's signature
+        self.items[4] = (self.path('missing.bin'), self.items[4][1])
+
+    def assertResults(self, results: list) -> None:
+        self.assertEqual([result.index for result in results], list(range(len(self.items))))
+        self.assertEqual([result.valid for result in results], [index not in (3, 4) for index in range(len(self.items))])
+        self.assertEqual(results[3].error, 'invalid signature')
+        self.assertIsNone(results[3].source)
+        self.assertEqual(results[4].source, self.path('missing.bin'))
+        self.assertTrue(results[4].error.startswith('FileNotFoundError'))
+
+    def test_in_process(self) -> None:
+        progress = []
+        self.assertResults(DigitalSigning.verifyMany(self.items, self.public_key, workers=1, batch_size=5, progress=lambda done, total: progress.append((done, total))))
+        self.assertEqual(progress, [(5, 12), (10, 12), (12, 12)])
+
+    def test_process_pool_keeps_input_order(self) -> None:
+        self.assertResults(DigitalSigning.verifyMany(self.items, self.public_key, workers=2, batch_size=2))
+
+class TestManifest(SigningTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.private_key, self.public_key = DigitalSigning.generateKeyPair(ED25519)
+        self.tree = self.path('tree')
+        self.files = {'a.txt': b'alpha', 'b.txt': b'beta', 'sub/c.txt': b'gamma', 'sub/d.txt': b'delta', 'sub/deep/e.txt': b'epsilon'}
+        for relative_path, data in self.files.items():
+            self.write(f'tree/{relative_path}', data)
+        self.manifest_path = self.path('tree', 'MANIFEST.json')
+
+    def test_sign_and_verify(self) -> None:
+        manifest = DigitalSigning.signManifest(self.tree, self.private_key, self.manifest_path)
+        self.assertEqual(manifest['rehashed'], len(self.files))
+        self.assertEqual([entry['path'] for entry in manifest['files']], sorted(self.files))  # The manifest itself is excluded
+        loaded = DigitalSigning.loadManifest(self.manifest_path)
+        self.assertTrue(DigitalSigning.verifyManifest(loaded, self.public_key, self.tree, self.manifest_path))
+
+        _, other_key = DigitalSigning.generateKeyPair(ED25519)
+        self.assertFalse(DigitalSigning.verifyManifest(loaded, other_key))
+
+    def test_tampering_is_detected(self) -> None:
+        manifest = DigitalSigning.signManifest(self.tree, self.private_key, self.manifest_path)
+        self.write('tree/sub/c.txt', b'GAMMA')
+        self.assertFalse(DigitalSigning.verifyManifestFile(self.tree, 'sub/c.txt', manifest, self.public_key))
+        self.assertTrue(DigitalSigning.verifyManifestFile(self.tree, 'a.txt', manifest, self.public_key))
+        self.assertFalse(DigitalSigning.verifyManifest(manifest, self.public_key, self.tree, self.manifest_path))
+
+        forged = dict(manifest, files=[dict(entry, digest='00' * 32) if entry['path'] == 'a.txt' else entry for entry in manifest['files']])
+        self.assertFalse(DigitalSigning.verifyManifest(forged, self.public_key))
+
+        self.write('tree/extra.txt', b'new')
+        self.write('tree/sub/c.txt', b'gamma')
+        self.assertFalse(DigitalSigning.verifyManifest(manifest, self.public_key, self.tree, self.manifest_path))
+
+    def test_proofs_for_every_leaf(self) -> None:
+        manifest = DigitalSigning.signManifest(self.tree, self.private_key)
+        for relative_path in self.files:
+            with self.subTest(path=relative_path):
+                proof = DigitalSigning.manifestProof(manifest, relative_path)
+                self.assertNotIn('files', proof)
+                self.assertTrue(DigitalSigning.verifyManifestFile(self.tree, relative_path, proof, self.public_key))
+                self.assertFalse(DigitalSigning.verifyManifestFile(self.tree, 'a.txt' if relative_path != 'a.txt' else 'b.txt', proof, self.public_key))
+        with self.assertRaises(KeyError):
+            DigitalSigning.manifestProof(manifest, 'missing.txt')
+
+    def test_odd_leaf_is_carried_up(self) -> None:
+        leaves = [_merkleLeaf(f'{index}.txt', bytes(32)) for index in range(5)]
+        levels = _merkleLevels(leaves)
+        self.assertEqual([len(level) for level in levels], [5, 3, 2, 1])
+        self.assertEqual(levels[1][2], leaves[4])  # No sibling: unchanged, not hashed with itself
+
+        # The last leaf's proof skips the levels where it has no sibling
+        manifest = {'files': [{'path': f'{index}.txt', 'digest': '00' * 32} for index in range(5)], 'root': levels[-1][0].hex(), 'signature': ''}
+        proof = DigitalSigning.manifestProof(manifest, '4.txt')['proof']
+        self.assertEqual(proof, [['L', levels[2][0].hex()]])
+        self.assertEqual(_merkleFold(leaves[4], proof), levels[-1][0])
+
+    def test_resign_rehashes_only_changed_files(self) -> None:
+        first = DigitalSigning.signManifest(self.tree, self.private_key, self.manifest_path)
+        second = DigitalSigning.signManifest(self.tree, self.private_key, self.manifest_path)
+        self.assertEqual(second['rehashed'], 0)
+        self.assertEqual(second['root'], first['root'])
+
+        self.write('tree/sub/d.txt', b'delta v2')
+        third = DigitalSigning.signManifest(self.tree, self.private_key, self.manifest_path)
+        self.assertEqual(third['rehashed'], 1)
+        self.assertNotEqual(third['root'], first['root'])
+        self.assertTrue(DigitalSigning.verifyManifest(third, self.public_key, self.tree, self.manifest_path))
+
+    def test_root_signature_is_not_a_data_signature(self) -> None:
+        manifest = DigitalSigning.signManifest(self.tree, self.private_key)
+        signature = base64.b64decode(manifest['signature'])
+        self.assertFalse(DigitalSigning.verifySignature(bytes.fromhex(manifest['root']), signature, self.public_key))
+
+if __name__ == '__main__':
+    unittest.main()
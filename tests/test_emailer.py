@@ -0,0 +1,195 @@
+from cryptography.fernet import Fernet
+from email import message_from_bytes, policy
+from smtplib import SMTPNotSupportedError
+import socketserver
+import threading
+import unittest
+
+from components.async_emailer import AsyncEmailer, aiosmtplib
+from components.emailer import EmailQueue, Emailer, EmailerBase, MailMergeTemplate
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal plain-text SMTP dialogue: EHLO, AUTH, MAIL, RCPT, DATA, NOOP, RSET, QUIT."""
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self) -> None:
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply('220 stand-in ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith('EHLO'):
+                for extension in ('250-stand-in', '250-8BITMIME', '250 AUTH PLAIN LOGIN'):
+                    self.reply(extension)
+            elif command.startswith('HELO'):
+                self.reply('250 stand-in')
+            elif command.startswith('AUTH'):
+                self.reply('235 Authentication successful')
+            elif command.startswith('MAIL'):
+                with server.lock:
+                    scripted = server.mail_replies.pop(0) if server.mail_replies else None
+                self.reply(scripted or '250 OK')
+            elif command.startswith('RCPT'):
+                self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b'.\r\n', b''):
+                        break
+                    lines.append(data)
+                with server.lock:
+                    server.messages.append(b''.join(lines))
+                self.reply('250 Queued')
+            elif command in ('NOOP', 'RSET'):
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """Local SMTP server without TLS that records accepted messages."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = []
+        self.mail_replies = []  # Replies for the next MAIL FROM commands, e.g. '451 Try again later'
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+def setStandInCredentials(sender: type, server: SMTPStandIn) -> None:
+    key = Fernet.generate_key()
+    cipher = Fernet(key)
+    sender.setCredentials(
+        symmetric_key=key,
+        login_email=cipher.encrypt(b'sender@example.com'),
+        login_password=cipher.encrypt(b'secret'),
+        smtp_server=cipher.encrypt(b'127.0.0.1'),
+        smtp_port=cipher.encrypt(str(server.server_address[1]).encode()),
+    )
+    sender.starttls = False
+
+class TestMailMergeTemplate(unittest.TestCase):
+
+    def render(self, html: str) -> bytes:
+        template = MailMergeTemplate('Hallo $name', 'Grüße, $name', html)
+        return template.render({'email': 'user@example.com', 'name': 'Jürgen'}, 'Newsletter <news@example.com>')[2]
+
+    def test_long_lines_are_sent_quoted_printable(self) -> None:
+        html = '<table>' + '<td>Grüße</td>' * 500 + '$name</table>'  # One line of several KB
+        message, options = EmailerBase._mailOptions(self.render(html), supports_8bitmime=True)
+        self.assertEqual(options, ())
+        self.assertTrue(message.isascii())
+        self.assertLessEqual(max(len(line) for line in message.split(b'\r\n')), 998)
+        parsed = message_from_bytes(message, policy=policy.SMTP)
+        self.assertEqual(parsed.get_body(('html',)).get_content().rstrip('\r\n'), html.replace('$name', 'Jürgen'))
+        self.assertEqual(parsed.get_body(('plain',))['Content-Transfer-Encoding'], 'quoted-printable')
+
+    def test_short_lines_stay_8bit(self) -> None:
+        rendered = self.render('<p>Grüße, $name</p>')
+        self.assertEqual(EmailerBase._mailOptions(rendered, supports_8bitmime=True), (rendered, ('BODY=8BITMIME',)))
+        message, options = EmailerBase._mailOptions(rendered, supports_8bitmime=False)
+        self.assertEqual(options, ())
+        self.assertIn(b'Content-Transfer-Encoding: base64', message)
+
+class TestEmailQueue(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = SMTPStandIn()
+        setStandInCredentials(Emailer, self.server)
+
+    def tearDown(self) -> None:
+        Emailer.shutdown()
+        Emailer.starttls = True
+        self.server.close()
+
+    def test_enqueue_flush_delivers_everything(self) -> None:
+        Emailer.configureSession(pool_size=2)
+        Emailer.startQueue(workers=2)
+        for index in range(20):
+            Emailer.enqueue(f'user{index}@example.com', f'Notice {index}', 'Body')
+        self.assertTrue(Emailer.flush(timeout=10))
+
+        stats = Emailer.queueStats()
+        self.assertEqual((stats['sent'], stats['failed'], stats['queue_depth'], stats['in_flight']), (20, 0, 0, 0))
+        self.assertEqual(len(self.server.messages), 20)
+        self.assertLessEqual(self.server.connections, 2)  # Workers reuse pooled sessions
+
+    def test_transient_reply_is_retried(self) -> None:
+        self.server.mail_replies = ['451 Try again later']
+        Emailer.startQueue(workers=1, backoff=0.01)
+        Emailer.enqueue('user@example.com', 'Subject', 'Body')
+        self.assertTrue(Emailer.flush(timeout=10))
+
+        stats = Emailer.queueStats()
+        self.assertEqual((stats['sent'], stats['retries']), (1, 1))
+        self.assertEqual(Emailer.deadLetters(), [])
+
+    def test_permanent_reply_is_dead_lettered(self) -> None:
+        self.server.mail_replies = ['550 Mailbox unavailable']
+        Emailer.startQueue(workers=1, backoff=0.01)
+        Emailer.enqueue('user@example.com', 'Subject', 'Body')
+        self.assertTrue(Emailer.flush(timeout=10))
+
+        stats = Emailer.queueStats()
+        self.assertEqual((stats['sent'], stats['failed'], stats['retries']), (0, 1, 0))
+        job, error = Emailer.deadLetters()[0]
+        self.assertEqual(job[0], 'user@example.com')
+        self.assertIn('550', error)
+
+    def test_missing_starttls_is_not_retried(self) -> None:
+        Emailer.starttls = True  # The stand-in does not offer STARTTLS
+        Emailer.startQueue(workers=1, backoff=0.01)
+        Emailer.enqueue('user@example.com', 'Subject', 'Body')
+        self.assertTrue(Emailer.flush(timeout=10))
+        self.assertEqual(Emailer.queueStats()['retries'], 0)
+        self.assertEqual(len(Emailer.deadLetters()), 1)
+
+    def test_transient_classification(self) -> None:
+        self.assertTrue(EmailQueue.isTransient(ConnectionResetError()))
+        self.assertFalse(EmailQueue.isTransient(SMTPNotSupportedError('STARTTLS extension not supported by server.')))
+
+@unittest.skipIf(aiosmtplib is None, 'aiosmtplib is not installed')
+class TestAsyncEmailer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.server = SMTPStandIn()
+        setStandInCredentials(AsyncEmailer, self.server)
+
+    async def asyncTearDown(self) -> None:
+        await AsyncEmailer.closeSessions()
+        AsyncEmailer.starttls = True
+        self.server.close()
+
+    async def test_send_email_and_merge(self) -> None:
+        AsyncEmailer.configureSession(pool_size=2, timeout=10)
+        self.assertTrue(await AsyncEmailer.sendEmail('user@example.com', 'Subject', 'Body'))
+        template = MailMergeTemplate('Hallo $name', 'Grüße, $name')
+        counts = await AsyncEmailer.sendMerge(template, ({'email': f'user{index}@example.com', 'name': f'Jürgen {index}'} for index in range(5)))
+        self.assertEqual((counts['sent'], counts['failed']), (5, 0))
+        self.assertEqual(len(self.server.messages), 6)
+        self.assertTrue(any('Grüße, Jürgen 0'.encode() in message for message in self.server.messages))
+
+    async def test_credentials_are_kept_per_sender(self) -> None:
+        self.assertEqual(AsyncEmailer.accessCredentials()[2:], ('127.0.0.1', str(self.server.server_address[1])))
+        self.assertIsNot(AsyncEmailer.secrets, Emailer.secrets)
+
+if __name__ == '__main__':
+    unittest.main()
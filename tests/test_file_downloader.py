@@ -0,0 +1,260 @@
+from contextlib import ExitStack
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+from components.file_downloader import DownloadManager, FileDownloader
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves `server.data`, honouring Range/If-Range unless `server.ranges` is off."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        server = self.server
+        data = server.data
+        requested = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        with server.lock:
+            server.ranges_requested.append(requested)
+
+        if requested and server.ranges and (if_range is None or if_range == server.etag):
+            match = re.fullmatch(r'bytes=(\d+)-(\d*)', requested)
+            start = int(match.group(1))
+            end = min(int(match.group(2)) if match.group(2) else len(data) - 1, len(data) - 1)
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(data)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = data[start:end + 1]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(data)}')
+        else:
+            body = data
+            self.send_response(200)
+        if server.ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', server.etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        with server.lock:
+            drop_after, server.drop_after = server.drop_after, None
+        if drop_after is not None and len(body) > drop_after:
+            # Send part of the body, then drop the connection mid-transfer
+            self.wfile.write(body[:drop_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+class RangeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, data: bytes, ranges: bool = True) -> None:
+        super().__init__(('127.0.0.1', 0), RangeHandler)
+        self.data = data
+        self.ranges = ranges
+        self.etag = '"v1"'
+        self.drop_after = None  # Truncate the next response body after this many bytes
+        self.ranges_requested = []
+        self.lock = threading.Lock()
+        self.url = f'http://127.0.0.1:{self.server_address[1]}/artifact.bin'
+
+    def __enter__(self) -> 'RangeServer':
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
+
+class TestSegmentedDownload(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data = os.urandom(256 * 1024 + 123)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'artifact.bin')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def assertDownloaded(self) -> None:
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertFalse(os.path.exists(self.path + '.part'))
+        self.assertFalse(os.path.exists(self.path + '.part.json'))
+
+    def test_full_file(self) -> None:
+        with RangeServer(self.data) as server:
+            size = FileDownloader.download_segmented(server.url, self.path, segments=1)
+        self.assertEqual(size, len(self.data))
+        self.assertDownloaded()
+        self.assertEqual(server.ranges_requested, ['bytes=0-'])
+
+    def test_range_split(self) -> None:
+        with RangeServer(self.data) as server:
+            FileDownloader.download_segmented(server.url, self.path, segments=4, min_segment_size=64 * 1024)
+        self.assertDownloaded()
+        self.assertEqual(server.ranges_requested[0], 'bytes=0-0')  # Probe
+        segments = sorted(tuple(int(bound) for bound in value[6:].split('-')) for value in server.ranges_requested[1:])
+        self.assertEqual(len(segments), 4)
+        # Contiguous ranges covering the whole file
+        self.assertEqual(segments[0][0], 0)
+        self.assertEqual(segments[-1][1], len(self.data) - 1)
+        for previous, current in zip(segments, segments[1:]):
+            self.assertEqual(current[0], previous[1] + 1)
+
+    def test_no_range_fallback(self) -> None:
+        with RangeServer(self.data, ranges=False) as server:
+            size = FileDownloader.download_segmented(server.url, self.path, segments=4, min_segment_size=64 * 1024)
+        self.assertEqual(size, len(self.data))
+        self.assertDownloaded()
+        self.assertEqual(len(server.ranges_requested), 1)  # The probe's full reply is the download
+
+    def test_retry_resumes_after_dropped_connection(self) -> None:
+        with RangeServer(self.data) as server:
+            server.drop_after = 100 * 1024
+            FileDownloader.download_segmented(server.url, self.path, segments=1, retries=2, backoff=0, chunk_size=16 * 1024)
+        self.assertDownloaded()
+        # The retry asks only for the bytes after what reached the .part file
+        resumed = server.ranges_requested[-1]
+        self.assertGreater(int(resumed[6:].split('-')[0]), 0)
+
+    def test_later_call_resumes_from_journal(self) -> None:
+        with RangeServer(self.data) as server:
+            server.drop_after = 100 * 1024
+            with self.assertRaises(Exception):
+                FileDownloader.download_segmented(server.url, self.path, segments=1, retries=0, chunk_size=16 * 1024)
+            self.assertTrue(os.path.exists(self.path + '.part.json'))
+
+            FileDownloader.download_segmented(server.url, self.path, segments=1, retries=0, chunk_size=16 * 1024)
+        self.assertDownloaded()
+        self.assertGreater(int(server.ranges_requested[-1][6:].split('-')[0]), 0)
+
+    def test_changed_file_restarts(self) -> None:
+        with RangeServer(self.data) as server:
+            server.drop_after = 100 * 1024
+            with self.assertRaises(Exception):
+                FileDownloader.download_segmented(server.url, self.path, segments=1, retries=0, chunk_size=16 * 1024)
+
+            self.data = os.urandom(len(self.data))
+            server.data, server.etag = self.data, '"v2"'
+            FileDownloader.download_segmented(server.url, self.path, segments=1, retries=0, chunk_size=16 * 1024)
+        self.assertDownloaded()
+
+    def test_single_stream_is_hashed_while_streaming(self) -> None:
+        expected = hashlib.sha256(self.data).hexdigest()
+        hash_prefix = FileDownloader._hashPrefix
+        with RangeServer(self.data) as server, mock.patch.object(FileDownloader, '_hashPrefix', side_effect=hash_prefix) as prefix:
+            server.drop_after = 100 * 1024
+            FileDownloader.download_segmented(server.url, self.path, segments=1, retries=1, backoff=0, chunk_size=16 * 1024, sha256=expected)
+        self.assertDownloaded()
+        # Only the bytes already on disk before the resume are read back, never the whole file
+        self.assertTrue(all(call.args[1] < len(self.data) for call in prefix.call_args_list))
+
+    def test_segments_are_hashed_after_download(self) -> None:
+        with RangeServer(self.data) as server:
+            FileDownloader.download_segmented(server.url, self.path, segments=4, min_segment_size=64 * 1024, sha256=hashlib.sha256(self.data).hexdigest())
+        self.assertDownloaded()
+
+    def test_checksum_mismatch_is_not_kept(self) -> None:
+        with RangeServer(self.data) as server:
+            with self.assertRaises(ValueError):
+                FileDownloader.download_segmented(server.url, self.path, segments=1, sha256='0' * 64)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + '.part'))
+
+    def test_malformed_url_is_not_retried(self) -> None:
+        with mock.patch('time.sleep', side_effect=AssertionError('retried')):
+            with self.assertRaises(requests.exceptions.MissingSchema):
+                FileDownloader.download_segmented('example.com/artifact.bin', self.path, retries=3)
+
+    def test_download_file_reports_rejected_checksum(self) -> None:
+        with RangeServer(self.data) as server:
+            self.assertFalse(FileDownloader.download_file(server.url, self.path, sha256='0' * 64))
+            self.assertFalse(os.path.exists(self.path))
+            self.assertTrue(FileDownloader.download_file(server.url, self.path, sha256=hashlib.sha256(self.data).hexdigest()))
+        self.assertDownloaded()
+
+    def test_download_file_without_resume_discards_partial(self) -> None:
+        # A stale .part whose journal claims it is complete
+        with open(self.path + '.part', 'wb') as f:
+            f.write(bytes(len(self.data)))
+        with open(self.path + '.part.json', 'w', encoding='utf-8') as f:
+            json.dump({'url': '', 'total': len(self.data), 'validator': '"v1"', 'segments': [[0, len(self.data) - 1, len(self.data)]]}, f)
+        with RangeServer(self.data) as server:
+            self.assertTrue(FileDownloader.download_file(server.url, self.path, segments=2, resume=False))
+        self.assertDownloaded()
+
+    def test_import_does_not_need_cryptography(self) -> None:
+        code = "import sys; sys.modules['cryptography'] = None; import components.file_downloader"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, '-c', code], cwd=root, check=True)
+
+class TestDownloadManager(unittest.TestCase):
+
+    def test_downloads_batch_in_order(self) -> None:
+        files = [os.urandom(1024 * (index + 1)) for index in range(5)]
+        with tempfile.TemporaryDirectory() as directory, ExitStack() as servers:
+            jobs = [(servers.enter_context(RangeServer(data)).url, os.path.join(directory, f'{index}.bin')) for index, data in enumerate(files)]
+            jobs.append(('htp://127.0.0.1/missing.bin', os.path.join(directory, 'missing.bin')))
+            with DownloadManager(workers=3, per_host=2) as manager:
+                results = manager.download(jobs)
+
+            self.assertEqual([result.ok for result in results], [True] * len(files) + [False])
+            for (_, path), data in zip(jobs, files):
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(), data)
+            self.assertEqual(manager.stats()['files_failed'], 1)
+
+    def test_busy_host_does_not_hold_every_worker(self) -> None:
+        slow, fast = 'http://slow.example', 'http://fast.example'
+        fast_done = threading.Event()
+        lock = threading.Lock()
+        in_flight, peak, fast_count = {slow: 0, fast: 0}, {slow: 0, fast: 0}, [0]
+
+        def fake_download(url, path, **kwargs):
+            host = url.rsplit('/', 1)[0]
+            with lock:
+                in_flight[host] += 1
+                peak[host] = max(peak[host], in_flight[host])
+            try:
+                if host == slow:
+                    # Only finishes once the other host's jobs got through
+                    if not fast_done.wait(5):
+                        raise TimeoutError('fast host starved')
+                else:
+                    with lock:
+                        fast_count[0] += 1
+                        if fast_count[0] == 2:
+                            fast_done.set()
+                return 0
+            finally:
+                with lock:
+                    in_flight[host] -= 1
+
+        jobs = [(f'{slow}/{index}', f'slow-{index}') for index in range(6)] + [(f'{fast}/{index}', f'fast-{index}') for index in range(2)]
+        with mock.patch.object(FileDownloader, 'download_segmented', side_effect=fake_download), mock.patch('os.makedirs'):
+            with DownloadManager(workers=4, per_host=2) as manager:
+                results = manager.download(jobs)
+        self.assertTrue(all(result.ok for result in results), [result.error for result in results])
+        self.assertEqual(peak[slow], 2)
+
+if __name__ == '__main__':
+    unittest.main()